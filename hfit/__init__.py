@@ -6,9 +6,6 @@ hfit Module
 Provides functionality to translate HTML files while preserving structure.
 """
 
-# Expose the core translation function as the primary API
-from .core import run_translation
-
 # Optionally expose lower-level components if needed for advanced usage
 # from .translation_services import get_translation_service, list_available_translation_services
 # from .html_processor import HTMLProcessor
@@ -16,4 +13,17 @@ from .core import run_translation
 # Define package version (optional but good practice)
 __version__ = "0.1.0"
 
-# The rest of the original file content remains unchanged 
\ No newline at end of file
+
+def __getattr__(name):
+    """按需加载核心API（PEP 562）
+
+    `from .core import run_translation` 会连带导入bs4/requests等重量级依赖，
+    让只想读 __version__ 的 `import hfit` 也付出几百毫秒的启动开销。
+    改为在首次访问 run_translation 时才导入。
+    """
+    if name == "run_translation":
+        from .core import run_translation
+        return run_translation
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# The rest of the original file content remains unchanged
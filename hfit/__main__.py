@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+hfit 的 python -m hfit 入口
+
+默认走cli.main()的argparse路径；当环境变量 HFIT_FAST=1 时走快速路径：
+选项全部从环境变量读取，argv只包含输入文件路径，完全跳过argparse。
+这条路径是给把hfit当作子进程反复调用的服务端场景准备的，
+每次调用能省下参数解析的固定开销。
+
+快速路径支持的环境变量：
+    HFIT_SERVICE  翻译服务名称，默认: bing
+    HFIT_FROM     源语言代码，默认: en
+    HFIT_TO       目标语言代码，默认: zh-CN
+    HFIT_MODE     翻译模式 simple/advanced，默认: simple
+"""
+
+import os
+import sys
+
+
+def _fast_main():
+    """环境变量驱动的快速入口，不经过argparse"""
+    if len(sys.argv) < 2:
+        sys.stderr.write("用法: HFIT_FAST=1 python -m hfit <输入HTML文件>\n")
+        return 1
+
+    from .core import run_translation
+
+    env = os.environ
+    try:
+        run_translation(
+            input_file=sys.argv[1],
+            output_file=sys.argv[2] if len(sys.argv) > 2 else None,
+            source_language=env.get("HFIT_FROM", "en"),
+            target_language=env.get("HFIT_TO", "zh-CN"),
+            translation_service_name=env.get("HFIT_SERVICE", "bing"),
+            mode=env.get("HFIT_MODE", "simple"),
+        )
+        return 0
+    except Exception:
+        # 错误信息已在 run_translation 中打印
+        return 1
+
+
+if __name__ == "__main__":
+    if os.environ.get("HFIT_FAST") == "1":
+        sys.exit(_fast_main())
+    from .cli import main
+    sys.exit(main())
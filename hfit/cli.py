@@ -6,12 +6,15 @@ hfit CLI Entry Point
 Handles command-line argument parsing and initiates the translation process.
 """
 
+import os
 import sys
 import argparse
-# 从 .core 导入核心翻译函数
-from .core import run_translation 
 # 从 .config 导入命令行选项所需的常量
-from .config import TRANSLATION_SERVICE_OPTIONS
+from .config import TRANSLATION_SERVICE_OPTIONS, TRANSLATION_SERVICE_HELP
+
+# 注意：不在模块顶层导入 .core —— 它会连带导入bs4/requests等重量级依赖，
+# 让 --help 和参数错误这类快速路径白白付出数百毫秒的启动开销。
+# run_translation 在参数校验通过后才按需导入（见main()）。
 
 # 翻译工具命令行选项
 def add_translation_options(parser):
@@ -20,11 +23,14 @@ def add_translation_options(parser):
     Args:
         parser: argparse.ArgumentParser 实例
     """
-    parser.add_argument("-i", "--input-file", dest="input_file", help="要翻译的HTML文件")
-    parser.add_argument("-o", "--output-file", dest="output_file", help="输出的HTML文件路径")
+    parser.add_argument("-i", "--input-file", dest="input_files", nargs="+",
+                        help="要翻译的HTML文件，可指定多个")
+    parser.add_argument("-o", "--output-file", dest="output_file", help="输出的HTML文件路径（仅单个输入文件时有效）")
+    parser.add_argument("--jobs", dest="jobs", type=int, default=1,
+                        help="多文件时的并行进程数，默认: 1")
     parser.add_argument("-s", "--service", dest="translation_service", 
                         choices=TRANSLATION_SERVICE_OPTIONS, default="bing",
-                        help=f"翻译服务类型，支持: {', '.join(TRANSLATION_SERVICE_OPTIONS)}")
+                        help=f"翻译服务类型，支持: {TRANSLATION_SERVICE_HELP}")
     
     parser.add_argument("--from", dest="source_language", default="en", 
                         help="源语言代码，默认: en (英语)")
@@ -35,6 +41,13 @@ def add_translation_options(parser):
     parser.add_argument("-mode", choices=['simple', 'advanced'], default='simple',
                         help="翻译模式：simple(简单模式，不保留标签结构)或advanced(高级模式，保留语义块内的标签结构)")
     
+    # 翻译缓存选项
+    parser.add_argument("--cache-path", dest="cache_path",
+                        default="~/.cache/hfit/translations.sqlite",
+                        help="翻译缓存SQLite文件路径，默认: ~/.cache/hfit/translations.sqlite")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true", default=False,
+                        help="禁用翻译缓存")
+
     # 调试选项
     parser.add_argument("-debug", "--verbose", dest="debug", action="store_true", default=False,
                         help="显示调试信息")
@@ -60,29 +73,80 @@ def main():
     #     parser.print_help()
     #     sys.exit(1)
     # 简化：当前只使用 -i/--input-file 或 --input_file 参数
-    if not args.input_file:
+    if not args.input_files:
          parser.print_help()
          print("\n错误：缺少输入文件。请使用 -i 或 --input-file 指定。")
          sys.exit(1)
 
+    # 目录参数展开为其中的HTML文件，整目录批量翻译无需逐个列出文件
+    input_files = []
+    for path in args.input_files:
+        if os.path.isdir(path):
+            input_files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(('.html', '.htm'))
+            ))
+        else:
+            input_files.append(path)
+    if not input_files:
+        print("错误：指定的目录中没有HTML文件。")
+        sys.exit(1)
+    args.input_files = input_files
+
+    if len(args.input_files) > 1 and args.output_file:
+        print("错误：指定多个输入文件时不能使用 -o/--output-file，输出路径将自动生成。")
+        sys.exit(1)
+
     html_debug = args.html_debug or args.debug
     trans_debug = args.trans_debug or args.debug
 
-    try:
-        run_translation(
-            input_file=args.input_file,
-            output_file=args.output_file,
-            source_language=args.source_language,
-            target_language=args.target_language,
-            translation_service_name=args.translation_service,
-            mode=args.mode,
-            html_debug=html_debug,
-            trans_debug=trans_debug
-        )
-        return 0 # 成功退出
-    except Exception:
-        # 错误信息已在 run_translation 中打印
-        return 1 # 失败退出
+    # 参数校验通过后才导入核心模块及其重量级依赖
+    from .core import run_translation
+
+    common_kwargs = dict(
+        source_language=args.source_language,
+        target_language=args.target_language,
+        translation_service_name=args.translation_service,
+        mode=args.mode,
+        html_debug=html_debug,
+        trans_debug=trans_debug,
+        cache_path=None if args.no_cache else args.cache_path,
+    )
+
+    if len(args.input_files) == 1:
+        try:
+            run_translation(
+                input_file=args.input_files[0],
+                output_file=args.output_file,
+                **common_kwargs
+            )
+            return 0 # 成功退出
+        except Exception:
+            # 错误信息已在 run_translation 中打印
+            return 1 # 失败退出
+
+    # 多文件：用进程池并行翻译，摊薄每个文件的启动和服务初始化开销。
+    # 各进程共享同一个SQLite缓存文件（WAL模式支持多进程读写），
+    # 重复出现的文本只需要翻译一次。
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    jobs = max(1, args.jobs)
+    failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(run_translation, input_file=input_file, **common_kwargs): input_file
+            for input_file in args.input_files
+        }
+        for future in as_completed(futures):
+            input_file = futures[future]
+            try:
+                future.result()
+            except Exception:
+                # 错误信息已在 run_translation 中打印
+                print(f"[错误] 文件翻译失败: {input_file}")
+                failed += 1
+
+    return 1 if failed else 0
 
 if __name__ == "__main__":
     sys.exit(main()) 
\ No newline at end of file
@@ -11,7 +11,8 @@ hfit 配置模块
 5. UUID 生成函数
 """
 
-import uuid
+import os
+import re
 
 # 标记标识符
 START_MARK = "@%"
@@ -19,18 +20,28 @@ END_MARK = "#$"
 START_MARK0 = "@ %"
 END_MARK0 = "# $"
 
-# 不翻译的HTML标签
-HTML_TAGS_NO_TRANSLATE = ['TITLE', 'SCRIPT', 'STYLE', 'TEXTAREA', 'SVG', 'svg']
-HTML_TAGS_INLINE_IGNORE = ['BR', 'CODE', 'KBD', 'WBR']
-HTML_TAGS_INLINE_TEXT = ['A', 'ABBR', 'ACRONYM', 'B', 'BDO', 'BIG', 'CITE', 'DFN', 'EM', 'I', 'LABEL', 'Q', 'S', 'SMALL', 'SPAN', 'STRONG', 'SUB', 'SUP', 'U', 'TT', 'VAR']
+# 预编译的标记匹配正则，供调用方用finditer一次扫描提取标记区间，
+# 代替逐字符的str.find/str.split循环
+MARK_RE = re.compile(re.escape(START_MARK) + r"(.*?)" + re.escape(END_MARK), re.DOTALL)
+MARK_RE0 = re.compile(re.escape(START_MARK0) + r"(.*?)" + re.escape(END_MARK0), re.DOTALL)
+
+# 不翻译的HTML标签（统一小写，调用方用tag.name.lower()做O(1)成员判断）
+HTML_TAGS_NO_TRANSLATE = frozenset({'title', 'script', 'style', 'textarea', 'svg'})
+HTML_TAGS_INLINE_IGNORE = frozenset({'br', 'code', 'kbd', 'wbr'})
+HTML_TAGS_INLINE_TEXT = frozenset({'a', 'abbr', 'acronym', 'b', 'bdo', 'big', 'cite', 'dfn', 'em', 'i', 'label', 'q', 's', 'small', 'span', 'strong', 'sub', 'sup', 'u', 'tt', 'var'})
 
 TRANSLATION_SERVICE_OPTIONS = [
     "google",
-    "bing", 
+    "bing",
     "yandex",
     "argos"
 ]
 
+# 服务列表的派生常量在导入时算好：frozenset给成员判断用（O(1)），
+# 帮助文本字符串避免每次构建argparse时重复join
+TRANSLATION_SERVICE_OPTIONS_SET = frozenset(TRANSLATION_SERVICE_OPTIONS)
+TRANSLATION_SERVICE_HELP = ", ".join(TRANSLATION_SERVICE_OPTIONS)
+
 # 样式CSS - 与原项目风格一致但更改标识符
 DEFAULT_CSS = '''
 :root {
@@ -125,10 +136,34 @@ USER_CUSTOM_CSS = ''':root {
 .hfit-target-inner { font-family: inherit; }
 }'''
 
+def _minify_css(css):
+    """压缩CSS字符串（折叠空白符）
+
+    Args:
+        css: 原始CSS字符串
+
+    Returns:
+        压缩后的CSS字符串
+    """
+    return re.sub(r"\s+", " ", css).strip()
+
+# 在导入时一次性完成CSS压缩和UTF-8编码，
+# 避免每次运行翻译流程都重复这部分工作
+DEFAULT_CSS_MIN = _minify_css(DEFAULT_CSS)
+DYNAMIC_CSS_MIN = _minify_css(DYNAMIC_CSS)
+USER_CUSTOM_CSS_MIN = _minify_css(USER_CUSTOM_CSS)
+
+DEFAULT_CSS_BYTES = DEFAULT_CSS_MIN.encode("utf-8")
+DYNAMIC_CSS_BYTES = DYNAMIC_CSS_MIN.encode("utf-8")
+USER_CUSTOM_CSS_BYTES = USER_CUSTOM_CSS_MIN.encode("utf-8")
+
 def generate_session_id():
     """生成唯一的会话ID
-    
+
+    会话ID只在内部用于标记DOM节点，不需要UUID规范格式，
+    直接使用随机字节的十六进制表示即可，比uuid.uuid4()更快。
+
     Returns:
-        str: UUID字符串
+        str: 32位十六进制随机字符串
     """
-    return str(uuid.uuid4()) 
\ No newline at end of file
+    return os.urandom(16).hex() 
\ No newline at end of file
@@ -4,18 +4,55 @@
 Core translation logic for hfit.
 """
 
+import sys
 import time
 from .translation_services import get_translation_service
 from .html_processor import HTMLProcessor
 
+# 进程内翻译服务实例缓存：run_translation被当作库函数反复调用时
+# （批处理服务端场景），服务初始化（Argos模型加载、Bing会话令牌获取等）
+# 只需要做一次
+_SERVICE_CACHE: dict = {}
+
+
+def _get_cached_translation_service(service_name, source_language, target_language,
+                                    debug, cache_path):
+    """获取（必要时创建并缓存）翻译服务实例
+
+    Args:
+        service_name: 翻译服务名称
+        source_language: 源语言代码
+        target_language: 目标语言代码
+        debug: 是否启用翻译服务调试信息
+        cache_path: 翻译缓存SQLite文件路径
+
+    Returns:
+        翻译服务实例
+    """
+    key = (service_name, source_language, target_language, debug, cache_path)
+    service = _SERVICE_CACHE.get(key)
+    if service is None:
+        service = get_translation_service(
+            service_name=service_name,
+            source_language=source_language,
+            target_language=target_language,
+            debug=debug,
+            cache_path=cache_path
+        )
+        _SERVICE_CACHE[key] = service
+    return service
+
 def run_translation(input_file: str, 
                     output_file: str | None = None, 
                     source_language: str = 'en', 
                     target_language: str = 'zh-CN', 
                     translation_service_name: str = 'bing', 
-                    mode: str = 'simple', 
-                    html_debug: bool = False, 
-                    trans_debug: bool = False):
+                    mode: str = 'simple',
+                    html_debug: bool = False,
+                    trans_debug: bool = False,
+                    batch_size: int = 50,
+                    max_concurrency: int = 8,
+                    cache_path: str | None = '~/.cache/hfit/translations.sqlite'):
     """执行核心的HTML文件翻译流程。
 
     Args:
@@ -27,6 +64,9 @@ def run_translation(input_file: str,
         mode: 翻译模式 ('simple' 或 'advanced')。
         html_debug: 是否启用HTML处理调试信息。
         trans_debug: 是否启用翻译服务调试信息。
+        batch_size: 单次发送给翻译服务的文本段数量上限。
+        max_concurrency: 并发发送翻译批次的最大线程数。
+        cache_path: 翻译缓存SQLite文件路径，传None禁用缓存。
     
     Returns:
         str: 输出文件的路径。
@@ -36,26 +76,31 @@ def run_translation(input_file: str,
     """
     preserve_tags_structure = (mode == 'advanced')
 
-    print("\n========== hfit ==========")
-    print(f"输入文件：{input_file}")
-    print(f"输出文件：{output_file or '自动生成'}")
-    print(f"源语言：{source_language}")
-    print(f"目标语言：{target_language}")
-    print(f"翻译服务：{translation_service_name}")
-    print(f"翻译模式：{'高级模式(保留语义块内的标签结构)' if preserve_tags_structure else '简单模式'}")
-    print(f"HTML调试：{'开启' if html_debug else '关闭'}")
-    print(f"翻译调试：{'开启' if trans_debug else '关闭'}")
-    print("============================\n")
+    # 配置横幅拼成一个字符串一次性写出：并行调用run_translation时
+    # 多行print会交错，且每行print都是一次write系统调用
+    sys.stdout.write(
+        "\n========== hfit ==========\n"
+        f"输入文件：{input_file}\n"
+        f"输出文件：{output_file or '自动生成'}\n"
+        f"源语言：{source_language}\n"
+        f"目标语言：{target_language}\n"
+        f"翻译服务：{translation_service_name}\n"
+        f"翻译模式：{'高级模式(保留语义块内的标签结构)' if preserve_tags_structure else '简单模式'}\n"
+        f"HTML调试：{'开启' if html_debug else '关闭'}\n"
+        f"翻译调试：{'开启' if trans_debug else '关闭'}\n"
+        "============================\n\n"
+    )
 
     start_time = time.time()
 
     try:
         print(f"[主程序] 正在初始化翻译服务：{translation_service_name}...")
-        translation_service = get_translation_service(
-            service_name=translation_service_name, 
-            source_language=source_language, 
+        translation_service = _get_cached_translation_service(
+            service_name=translation_service_name,
+            source_language=source_language,
             target_language=target_language,
-            debug=trans_debug
+            debug=trans_debug,
+            cache_path=cache_path
         )
         print(f"[主程序] 翻译服务初始化完成")
     except Exception as e:
@@ -66,7 +111,9 @@ def run_translation(input_file: str,
     html_processor = HTMLProcessor(
         translation_service=translation_service,
         preserve_tags_structure=preserve_tags_structure,
-        debug=html_debug
+        debug=html_debug,
+        batch_size=batch_size,
+        max_concurrency=max_concurrency
     )
 
     try:
@@ -12,12 +12,50 @@ hfit 的HTML处理模块
 import os
 import copy
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup, NavigableString, Comment, Tag
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional
 
-from hfit.config import HTML_TAGS_NO_TRANSLATE, HTML_TAGS_INLINE_TEXT, HTML_TAGS_INLINE_IGNORE, DEFAULT_CSS, DYNAMIC_CSS, USER_CUSTOM_CSS, generate_session_id
+from hfit.config import HTML_TAGS_NO_TRANSLATE, HTML_TAGS_INLINE_TEXT, HTML_TAGS_INLINE_IGNORE, DEFAULT_CSS_MIN, DYNAMIC_CSS_MIN, USER_CUSTOM_CSS_MIN, generate_session_id
 from hfit.translation_services import TranslationService
 
+# 首选lxml（libxml2的C实现，比html.parser快5-10倍且标签名统一小写），
+# 未安装时回退到标准库解析器，保证功能可用
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+# 标签名在导入时预分类为整数，遍历热路径上一次dict查找（含默认值）
+# 就能同时回答"是否非内联"和"是否内联文本"，代替多次集合成员判断。
+# 0=非内联（默认，未收录的标签都算）、1=内联文本、2=内联忽略、3=不翻译
+_TAG_KIND = {}
+for _tag_name in HTML_TAGS_INLINE_TEXT:
+    _TAG_KIND[_tag_name] = 1
+for _tag_name in HTML_TAGS_INLINE_IGNORE:
+    _TAG_KIND[_tag_name] = 2
+for _tag_name in HTML_TAGS_NO_TRANSLATE:
+    _TAG_KIND[_tag_name] = 3
+del _tag_name
+
+
+class SemanticBlock(NamedTuple):
+    """语义块记录
+
+    NamedTuple在底层是C结构，比每块一个dict省大约5倍内存，
+    属性访问也更快——大文档会产生成千上万个语义块。
+
+    Attributes:
+        nodes: 块内的文本节点列表
+        common_ancestor: 包含全部文本节点的最小公共祖先
+        end_marker: 块结束位置的占位标记元素
+    """
+    nodes: list
+    common_ancestor: object
+    end_marker: object
+
+
 class HTMLProcessor:
     """HTML处理器，负责处理HTML的解析和双语显示
     
@@ -28,20 +66,29 @@ class HTMLProcessor:
     4. 将翻译结果添加到原始HTML中
     """
     
-    def __init__(self, translation_service: TranslationService, preserve_tags_structure=True, debug=True):
+    def __init__(self, translation_service: TranslationService, preserve_tags_structure=True, debug=True, batch_size=50, max_concurrency=8):
         """初始化HTML处理器
-        
+
         Args:
             translation_service: 翻译服务实例
             preserve_tags_structure: 是否保留语义块内的标签结构
             debug: 是否显示调试信息
+            batch_size: 单次发送给翻译服务的文本段数量上限
+            max_concurrency: 并发发送翻译批次的最大线程数
         """
         self.translation_service = translation_service
         self.session_id = generate_session_id()
         self.preserve_tags_structure = preserve_tags_structure
         self.debug = debug
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
         self.elements_count = 0
         self.processed_count = 0
+        # 专用于new_tag的空soup，见_create_translation_wrapper
+        self._tag_soup = BeautifulSoup('', PARSER)
+        # 包装器的三层font骨架固定不变，预构建一份模板，
+        # 每个语义块只做一次子树克隆，见_create_translation_wrapper
+        self._wrapper_template = self._build_wrapper_template()
         
     def debug_print(self, message):
         """输出调试信息
@@ -54,7 +101,12 @@ class HTMLProcessor:
             
     def translate_file(self, input_file: str, output_file: Optional[str] = None) -> str:
         """翻译HTML文件并保存结果
-        
+
+        注意：这条路径基于BeautifulSoup（lxml解析器），段落/语义块的
+        查找规则都依赖BS4的NavigableString兄弟节点模型；对超大文件
+        追求纯lxml性能时请使用translate_file_streaming，它直接在
+        lxml元素树上工作，不经过BS4包装层。
+
         Args:
             input_file: 输入HTML文件路径
             output_file: 输出HTML文件路径，如果不指定则自动生成
@@ -79,21 +131,16 @@ class HTMLProcessor:
         self.debug_print(f"[HTML处理] 输出文件: {output_file}")
         self.debug_print(f"[HTML处理] 翻译模式: {'保留语义块内的标签结构' if self.preserve_tags_structure else '简单模式'}")
             
-        # 读取HTML文件
-        self.debug_print(f"[HTML处理] 正在读取文件...")
+        # 翻译HTML内容：把打开的文件句柄直接交给解析器，
+        # 省掉f.read()先在内存里物化一份完整源文本的步骤
         start_time = time.time()
-        
-        with open(input_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-            
-        file_size = len(html_content)
-        read_time = time.time() - start_time
-        self.debug_print(f"[HTML处理] 文件读取完成，大小: {file_size} 字节，耗时: {read_time:.2f}秒")
-            
-        # 翻译HTML内容
+        file_size = os.path.getsize(input_file)
+        self.debug_print(f"[HTML处理] 文件大小: {file_size} 字节")
+
         self.debug_print(f"[HTML处理] 开始翻译HTML内容...")
         translate_start_time = time.time()
-        translated_html = self.translate_html_content(html_content)
+        with open(input_file, 'r', encoding='utf-8') as f:
+            translated_html = self.translate_html_content(f)
         translate_time = time.time() - translate_start_time
         self.debug_print(f"[HTML处理] 翻译完成，处理了 {self.processed_count} 个段落，耗时: {translate_time:.2f}秒")
         
@@ -106,7 +153,129 @@ class HTMLProcessor:
         self.debug_print(f"[HTML处理] 处理完成，总耗时: {total_time:.2f}秒")
             
         return output_file
-    
+
+    def translate_file_streaming(self, input_file: str, output_file: Optional[str] = None) -> str:
+        """流式翻译超大HTML文件并保存结果
+
+        与translate_file不同，这条路径不会把整个DOM常驻内存：
+        使用lxml的iterparse逐个解析body的直接子元素，按batch_size
+        凑满一批后整体翻译、追加翻译包装器、增量写出并释放已处理
+        的元素。适合几十MB级别的输入文件。
+
+        限制：该路径按简单模式翻译（不保留语义块内的标签结构）。
+
+        Args:
+            input_file: 输入HTML文件路径
+            output_file: 输出HTML文件路径，如果不指定则自动生成
+
+        Returns:
+            输出文件的路径
+
+        Raises:
+            FileNotFoundError: 如果输入文件不存在
+        """
+        from lxml import etree
+        from lxml import html as lxml_html
+
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"无法找到输入文件：{input_file}")
+
+        if not output_file:
+            basename = os.path.basename(input_file)
+            dirname = os.path.dirname(input_file)
+            name, ext = os.path.splitext(basename)
+            output_file = os.path.join(dirname, f"{name}_translated{ext}")
+
+        self.debug_print(f"\n[HTML处理] 开始流式处理文件: {input_file}")
+        self.debug_print(f"[HTML处理] 输出文件: {output_file}")
+
+        def collect_block_text(element):
+            """收集块元素中需要翻译的纯文本（跳过不翻译的子树）"""
+            if not isinstance(element.tag, str) or element.tag.lower() in HTML_TAGS_NO_TRANSLATE:
+                return []
+            parts = []
+            if element.text and element.text.strip():
+                parts.append(element.text.strip())
+            for child in element:
+                parts.extend(collect_block_text(child))
+                if child.tail and child.tail.strip():
+                    parts.append(child.tail.strip())
+            return parts
+
+        start_time = time.time()
+        pending_blocks = []
+        wrote_prolog = False
+        wrote_body_open = False
+
+        # 流式路径会按元素产生大量小段写入，用1MiB缓冲把write系统调用
+        # 从数千次压到数十次
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as out:
+
+            def flush_pending():
+                """翻译并写出已缓冲的块元素"""
+                if not pending_blocks:
+                    return
+                texts = [text for _, text in pending_blocks]
+                translated_texts = self._translate_in_batches(texts)
+                for (element, _), translated in zip(pending_blocks, translated_texts):
+                    if translated:
+                        wrapper = lxml_html.fragment_fromstring(
+                            self._wrapper_html(translated, is_simple_mode=True))
+                        element.append(wrapper)
+                    out.write(etree.tostring(element, encoding='unicode', method='html'))
+                    self.processed_count += 1
+                # 释放已写出的元素，保持内存占用有界
+                last_element = pending_blocks[-1][0]
+                parent = last_element.getparent()
+                last_element.clear()
+                if parent is not None:
+                    while last_element.getprevious() is not None:
+                        del parent[0]
+                pending_blocks.clear()
+
+            for _, element in etree.iterparse(input_file, events=('end',), html=True):
+                if not isinstance(element.tag, str):
+                    continue
+                tag = element.tag.lower()
+                parent = element.getparent()
+
+                if tag == 'head':
+                    # 写出文档头：注入CSS样式后整体序列化
+                    root = element.getroottree().getroot()
+                    attrs = ''.join(f' {k}="{v}"' for k, v in root.attrib.items())
+                    out.write(f'<!DOCTYPE html>\n<html hfit-state="dual"{attrs}>')
+                    for data_id, css in (('hfit-default-injected-css', DEFAULT_CSS_MIN),
+                                         ('hfit-dynamic-injected-css', DYNAMIC_CSS_MIN),
+                                         ('hfit-user-custom-style', USER_CUSTOM_CSS_MIN)):
+                        style = etree.SubElement(element, 'style')
+                        style.set('data-id', data_id)
+                        style.text = css
+                    out.write(etree.tostring(element, encoding='unicode', method='html'))
+                    wrote_prolog = True
+                elif parent is not None and isinstance(parent.tag, str) and parent.tag.lower() == 'body':
+                    if not wrote_prolog:
+                        out.write('<!DOCTYPE html>\n<html hfit-state="dual">')
+                        wrote_prolog = True
+                    if not wrote_body_open:
+                        # body的第一个子元素：写出body起始标签及前导文本
+                        body_attrs = ''.join(f' {k}="{v}"' for k, v in parent.attrib.items())
+                        out.write(f'<body data-hfit-walked="{self.session_id}"{body_attrs}>')
+                        if parent.text:
+                            out.write(parent.text)
+                        wrote_body_open = True
+                    text = ' '.join(collect_block_text(element))
+                    pending_blocks.append((element, text))
+                    if len(pending_blocks) >= self.batch_size:
+                        flush_pending()
+
+            flush_pending()
+            out.write('</body></html>')
+
+        total_time = time.time() - start_time
+        self.debug_print(f"[HTML处理] 流式处理完成，处理了 {self.processed_count} 个块，总耗时: {total_time:.2f}秒")
+
+        return output_file
+
     def _add_styles(self, soup):
         """添加必要的CSS样式到HTML头部
         
@@ -126,19 +295,19 @@ class HTMLProcessor:
         # 添加默认CSS样式
         style_tag = soup.new_tag('style')
         style_tag['data-id'] = 'hfit-default-injected-css'
-        style_tag.string = DEFAULT_CSS
+        style_tag.string = DEFAULT_CSS_MIN
         head.append(style_tag)
         
         # 添加动态CSS
         dynamic_style = soup.new_tag('style')
         dynamic_style['data-id'] = 'hfit-dynamic-injected-css'
-        dynamic_style.string = DYNAMIC_CSS
+        dynamic_style.string = DYNAMIC_CSS_MIN
         head.append(dynamic_style)
         
         # 添加用户自定义样式
         user_style = soup.new_tag('style')
         user_style['data-id'] = 'hfit-user-custom-style'
-        user_style.string = USER_CUSTOM_CSS
+        user_style.string = USER_CUSTOM_CSS_MIN
         head.append(user_style)
     
     def _find_paragraphs(self, soup):
@@ -150,6 +319,10 @@ class HTMLProcessor:
         2. 遇到<br>标签后的下一个元素，无论是否为内联元素，都标记为新段落
         3. 访问非内联元素整个块结束，视为紧接着存在一个换行符<br>
         4. 当<br>标签后面直接跟随文本（非元素）时，将该文本包装到span标签并标记为段落
+
+        规则2-4依赖兄弟节点间的顺序状态（br标记的传递），所以候选元素
+        不能用一条预编译的标签选择器一次性筛出——能下沉到解析器层做
+        批量匹配的部分（不翻译子树的根）已通过下面的find_all预收集完成。
         
         Args:
             soup: BeautifulSoup解析的HTML文档
@@ -163,9 +336,17 @@ class HTMLProcessor:
         # 记录已经被标记为段落的元素，避免重复
         marked_elements = set()
         
-        # 记录是否刚刚遇到了<br>标签或非内联块结束
-        just_saw_br = [False]  # 使用列表以便在递归中修改
-        
+        # 预先用三次find_all（SoupStrainer在解析器层匹配）收集所有
+        # 不翻译子树的根元素，遍历时只做一次O(1)的id成员判断，
+        # 代替对每个节点重复做标签名/class/translate属性三项检查
+        skip_root_ids = set()
+        for skip_element in soup.find_all(list(HTML_TAGS_NO_TRANSLATE)):
+            skip_root_ids.add(id(skip_element))
+        for skip_element in soup.find_all(class_='notranslate'):
+            skip_root_ids.add(id(skip_element))
+        for skip_element in soup.find_all(attrs={'translate': 'no'}):
+            skip_root_ids.add(id(skip_element))
+
         def mark_as_paragraph(element):
             """将元素标记为段落，并添加到需要翻译的列表中
             
@@ -180,46 +361,89 @@ class HTMLProcessor:
                 if not element.has_attr('data-hfit-walked'):
                     element['data-hfit-walked'] = self.session_id
                 
-                # 添加到段落列表
-                if element not in paragraphs_to_translate:
-                    paragraphs_to_translate.append(element)
-                    marked_elements.add(element)
+                # 添加到段落列表（外层的marked_elements判断已保证唯一性，
+                # 不再对列表做O(n)的成员扫描）
+                paragraphs_to_translate.append(element)
+                marked_elements.add(element)
         
-        def process_element(element, parent=None):
-            """递归处理元素及其子元素
-            
-            Args:
-                element: 当前处理的元素
-                parent: 父元素
-            """
-            # 检查是否应该跳过该元素
-            if (isinstance(element, Tag) and (
-                element.name.upper() in HTML_TAGS_NO_TRANSLATE or
-                element.get('class') and 'notranslate' in element.get('class') or
-                element.get('translate') == 'no')):
-                return
-            
+        root = soup.body if soup.body else soup
+
+        # 第一次遍历：按br/非内联规则标记段落。
+        # 用显式栈做深度优先遍历代替按节点递归：省掉每个节点的Python
+        # 调用帧开销，深层嵌套的文档也不会触碰递归上限。
+        # 栈条目为 (元素, 父元素, 阶段, 保存的状态)，EXIT阶段执行原递归
+        # 版本中"子元素处理完毕后"的br状态恢复逻辑
+        _ENTER, _EXIT = 0, 1
+        just_saw_br = False
+        stack = [(root, None, _ENTER, None)]
+
+        # 把热循环里反复访问的全局名/内建名绑定为局部变量，
+        # LOAD_FAST比LOAD_GLOBAL省一次字典查找——这是纯Python遍历
+        # 在不引入编译扩展的前提下能做的最后一档优化
+        _isinstance = isinstance
+        _Tag = Tag
+        _NavigableString = NavigableString
+        _tag_kind_get = _TAG_KIND.get
+        stack_pop = stack.pop
+        stack_append = stack.append
+
+        while stack:
+            element, parent, phase, saved = stack_pop()
+
+            if phase == _EXIT:
+                previous_br_state, is_non_inline = saved
+                # 规则3：非内联元素块结束后，设置just_saw_br为True
+                just_saw_br = True if is_non_inline else previous_br_state
+                continue
+
+            # 每个节点只做一次isinstance和标签名小写化
+            is_tag = _isinstance(element, _Tag)
+            name = element.name.lower() if is_tag else None
+
+            if not is_tag:
+                # 为带文本但未被br/非内联规则覆盖的内容补充段落标记。
+                # 祖先节点总是先于文本节点被访问，此时规则产生的祖先标记
+                # 已经齐备，因此这一步可以合并进同一趟遍历，不再需要
+                # 单独的第二次全文档遍历
+                # isspace()只做判断不构造新串，比strip()后看真值省一次字符串分配
+                if (_isinstance(element, _NavigableString) and not isinstance(element, Comment)
+                        and element and not element.isspace()):
+                    # 找到文本节点的容器元素
+                    container = element.parent
+                    while (container and _isinstance(container, _Tag) and
+                           _tag_kind_get(container.name.lower(), 0) == 1 and
+                           container not in marked_elements):
+                        container = container.parent
+
+                    if container and _isinstance(container, _Tag) and container not in marked_elements:
+                        mark_as_paragraph(container)
+                continue
+
+            # 检查是否应该跳过该元素（不翻译子树的根在预收集的集合中）
+            if id(element) in skip_root_ids:
+                continue
+
             # 如果是br标签，标记下一个元素，并处理后面的文本节点
-            if isinstance(element, Tag) and element.name.upper() == 'BR':
-                just_saw_br[0] = True
-                
+            if name == 'br':
+                just_saw_br = True
+
                 # 处理br后面直接跟随的文本节点
                 if parent and element.next_sibling and isinstance(element.next_sibling, NavigableString):
                     # 收集从br后到下一个br或父元素结束的所有连续文本
                     text_nodes = []
                     current = element.next_sibling
-                    
+
                     # 收集所有连续的文本节点，直到遇到br标签或非文本节点
-                    while current and isinstance(current, NavigableString):
-                        if current.strip():  # 只处理非空文本
+                    while current and _isinstance(current, _NavigableString):
+                        if current and not current.isspace():  # 只处理非空文本
                             text_nodes.append(current)
                         # 移动到下一个兄弟节点
                         next_node = current.next_sibling
                         # 如果下一个节点是br，则停止收集
-                        if next_node and isinstance(next_node, Tag) and next_node.name.upper() == 'BR':
+                        if next_node and _isinstance(next_node, _Tag) and next_node.name.lower() == 'br':
                             break
                         current = next_node
-                    
+
                     # 如果收集到了文本节点，创建span包装它们
                     if text_nodes:
                         # 取第一个文本节点作为位置标记
@@ -227,110 +451,64 @@ class HTMLProcessor:
                         # 创建一个新的span元素
                         span = soup.new_tag('span')
                         span['data-hfit-generated'] = '1'  # 标记这是自动生成的元素
-                        
-                        # 将所有文本节点内容合并
-                        combined_text = ''.join(str(node) for node in text_nodes)
+
+                        # 将所有文本节点内容合并：NavigableString本身就是str子类，
+                        # 直接join即可，无需逐个str()转换
+                        combined_text = ''.join(text_nodes)
                         span.string = combined_text
-                        
+
                         # 用新的span替换第一个文本节点
                         first_text.replace_with(span)
-                        
+
                         # 删除剩余的文本节点
                         for node in text_nodes[1:]:
                             if node.parent:  # 确保节点还在DOM树中
                                 node.extract()
-                        
+
                         # 标记这个span为段落
                         mark_as_paragraph(span)
-                
-                return
-            
-            # 检查元素是否为非内联元素
-            is_non_inline = False
-            if isinstance(element, Tag):
-                is_non_inline = element.name.upper() not in HTML_TAGS_INLINE_TEXT and element.name.upper() not in HTML_TAGS_INLINE_IGNORE
-            
+                        # 子元素在入栈时已快照，新建的span不会被再次访问；
+                        # 递归版本里紧随其后的span访问会消费br标记，这里等价复位
+                        just_saw_br = False
+
+                continue
+
+            # 检查元素是否为非内联元素（不翻译子树的根已在上面跳过，
+            # 走到这里的kind只会是0/1/2）
+            is_non_inline = _tag_kind_get(name, 0) == 0
+
             # 这两种情况需要将元素标记为新段落：
             # 1. 如果是非内联元素
             # 2. 如果刚刚看到了<br>标签或非内联块结束
-            if isinstance(element, Tag):
-                if is_non_inline or just_saw_br[0]:
+            if is_tag:
+                if is_non_inline or just_saw_br:
                     mark_as_paragraph(element)
-                    just_saw_br[0] = False  # 重置标记
-            
-            # 处理子元素
-            if isinstance(element, Tag):
-                previous_br_state = just_saw_br[0]  # 保存当前br状态
-                
-                # 首先处理直接子元素
-                for child in element.children:
-                    process_element(child, element)
-                
-                # 规则3：非内联元素块结束后，设置just_saw_br为True
-                if is_non_inline:
-                    just_saw_br[0] = True
-                else:
-                    # 恢复处理完子元素后的br状态
-                    just_saw_br[0] = previous_br_state
-        
-        # 开始处理
-        if soup.body:
-            process_element(soup.body)
-        else:
-            process_element(soup)
-        
-        # 第二次遍历：找出带有文本内容但尚未标记为段落的元素
-        def find_text_elements(element, parent=None):
-            """找出包含文本的元素
-            
-            Args:
-                element: 当前处理的元素
-                parent: 父元素
-            """
-            if isinstance(element, NavigableString) and not isinstance(element, Comment) and element.strip():
-                # 找到文本节点的容器元素
-                container = element.parent
-                while (container and isinstance(container, Tag) and 
-                       container.name.upper() in HTML_TAGS_INLINE_TEXT and 
-                       container not in marked_elements):
-                    container = container.parent
-                
-                if container and isinstance(container, Tag) and container not in marked_elements:
-                    mark_as_paragraph(container)
-            
-            # 递归处理子元素
-            if isinstance(element, Tag) and element.name.upper() not in HTML_TAGS_NO_TRANSLATE:
-                for child in element.children:
-                    find_text_elements(child, element)
-        
-        # 查找包含文本的元素
-        if soup.body:
-            find_text_elements(soup.body)
-        else:
-            find_text_elements(soup)
-        
+                    just_saw_br = False  # 重置标记
+
+                # 先压EXIT条目再按逆序压子元素，保证子元素按文档顺序出栈
+                stack_append((element, parent, _EXIT, (just_saw_br, is_non_inline)))
+                for child in reversed(element.contents):
+                    stack_append((child, element, _ENTER, None))
+
         # 调试输出
         self.debug_print(f"[HTML处理] 找到 {len(paragraphs_to_translate)} 个需要翻译的段落")
         
         return paragraphs_to_translate
     
-    def _create_translation_wrapper(self, translated_text, is_simple_mode=False):
-        """创建翻译包装器
-        
-        创建包含翻译结果的HTML包装器。
-        
+    def _wrapper_html(self, translated_text, is_simple_mode=False):
+        """生成翻译包装器的HTML字符串
+
         Args:
             translated_text: 翻译后的文本内容
             is_simple_mode: 是否是简单模式，如果是则设置深灰色样式
-            
+
         Returns:
-            BeautifulSoup对象，表示包装后的翻译内容
+            包装器HTML字符串
         """
-        # 创建翻译包装器
         # 如果是简单模式，添加深灰色样式
         inner_style = ' style="color:#2f4f4f;"' if is_simple_mode else ''
-        
-        wrapper_html = (
+
+        return (
             f'<font class="notranslate hfit-target-wrapper" '
             f'data-hfit-translation-element-mark="1" lang="{self.translation_service.target_language}">'
             f'<br>'
@@ -344,154 +522,137 @@ class HTMLProcessor:
             f'{translated_text}'
             f'</font></font></font>'
         )
-        
-        # 解析翻译包装器
-        wrapper = BeautifulSoup(wrapper_html, 'html.parser').find('font')
-        
-        return wrapper
-    
-    def _translate_semantic_block_with_structure(self, element):
-        """翻译语义块并保留其HTML结构
-        
-        这种方法直接深度复制元素的DOM结构，
-        然后处理每个文本节点，保留所有标签和属性。
-        
-        Args:
-            element: 要翻译的HTML元素/语义块
+
+    def _build_wrapper_template(self):
+        """构建翻译包装器的三层font模板
+
+        骨架在处理器生命周期内固定（目标语言也随实例固定），
+        只在初始化时构建一次，之后每个语义块克隆即可。
+
+        Returns:
+            Tag对象，空的包装器骨架
         """
-        # 标记段落已处理
-        element['data-hfit-paragraph'] = '1'
-        
-        # 处理前检查元素是否已包含翻译
-        if element.find(attrs={"data-hfit-translation-element-mark": "1"}):
-            # 清除所有已存在的翻译标记，避免重复翻译
-            for node in element.find_all(attrs={"data-hfit-translation-element-mark": "1"}):
-                node.decompose()
-        
-        # 直接处理整个元素，不再检查<br>标签
-        self._process_single_block(element)
-    
-    def _process_single_block(self, element):
-        """处理单个内容块的翻译
-        
+        builder = self._tag_soup
+
+        wrapper = builder.new_tag('font', attrs={
+            'class': 'notranslate hfit-target-wrapper',
+            'data-hfit-translation-element-mark': '1',
+            'lang': self.translation_service.target_language,
+        })
+        wrapper.append(builder.new_tag('br'))
+
+        block_wrapper = builder.new_tag('font', attrs={
+            'class': 'notranslate hfit-target-translation-theme-none '
+                     'hfit-target-translation-block-wrapper-theme-none '
+                     'hfit-target-translation-block-wrapper',
+            'data-hfit-translation-element-mark': '1',
+        })
+        wrapper.append(block_wrapper)
+
+        inner = builder.new_tag('font', attrs={
+            'class': 'notranslate hfit-target-inner '
+                     'hfit-target-translation-theme-none-inner',
+            'data-hfit-translation-element-mark': '1',
+        })
+        block_wrapper.append(inner)
+
+        return wrapper
+
+    def _create_translation_wrapper(self, translated_text, is_simple_mode=False):
+        """创建翻译包装器
+
+        克隆预构建的三层font模板（copy.copy即Tag.__copy__，整棵
+        子树连同属性独立复制），再填入译文。只有译文本身含标记
+        （高级模式保留的标签结构）时才需要对这一小段做片段解析。
+
         Args:
-            element: 要处理的HTML元素
+            translated_text: 翻译后的文本内容
+            is_simple_mode: 是否是简单模式，如果是则设置深灰色样式
+
+        Returns:
+            Tag对象，表示包装后的翻译内容
         """
-        # 深度复制元素
-        element_clone = copy.deepcopy(element)
-        
-        # 移除已有的翻译内容
-        for node in element_clone.find_all(attrs={"data-hfit-translation-element-mark": True}):
-            node.decompose()
-        
-        # 标记所有子标签
-        for tag in element_clone.find_all(True):
-            tag['data-hfit-walked'] = self.session_id
-        
-        # 提取要翻译的纯文本
-        texts_to_translate = []
-        text_nodes = []
-        
-        # 递归查找所有文本节点
-        self._find_text_nodes(element_clone, text_nodes)
-        
-        # 如果没有文本节点，直接返回
-        if not text_nodes:
-            return
-        
-        # 提取文本并准备翻译
-        for node in text_nodes:
-            text = node.string.strip()
-            if text:
-                texts_to_translate.append(text)
-                
-        # 批量翻译文本
-        translated_texts = []
-        if texts_to_translate:
-            translated_texts = self.translation_service.translate_batch(texts_to_translate)
-        
-        # 用翻译后的文本替换原始文本
-        for i, node in enumerate(text_nodes):
-            if i < len(translated_texts):
-                node.string.replace_with(translated_texts[i])
-        
-        # 创建并添加翻译包装器
-        translated_content = element_clone.decode_contents()
-        wrapper = self._create_translation_wrapper(translated_content)
-        element.append(wrapper)
+        wrapper = copy.copy(self._wrapper_template)
+        # 模板结构固定：children = [br, block_wrapper]，inner是
+        # block_wrapper的唯一子元素
+        inner = wrapper.contents[1].contents[0]
+        # 如果是简单模式，添加深灰色样式
+        if is_simple_mode:
+            inner['style'] = 'color:#2f4f4f;'
+
+        if '<' in translated_text:
+            # 片段解析用html.parser：它不会像lxml那样补全html/body外壳
+            fragment = BeautifulSoup(translated_text, 'html.parser')
+            for node in list(fragment.contents):
+                inner.append(node)
+        else:
+            inner.append(NavigableString(translated_text))
+
+        return wrapper
     
-    def _translate_semantic_block_simple(self, element):
-        """简单翻译语义块，不保留HTML结构
-        
-        这种方法只翻译纯文本内容，不保留标签结构。
-        
+    def _clone_element(self, element):
+        """复制元素子树（序列化后重新解析）
+
+        copy.deepcopy在BS4树上要逐节点经过Python层的__copy__重建，
+        是高级模式里最大的分配热点；str()走C侧格式化、重解析走lxml，
+        整体比deepcopy快数倍。后续清理逻辑基于BS4的值相等比较，
+        与deepcopy产生的独立克隆行为一致。
+
         Args:
-            element: 要翻译的HTML元素/语义块
+            element: 要复制的HTML元素
+
+        Returns:
+            克隆出的同名元素
         """
-        # 标记段落已处理
-        element['data-hfit-paragraph'] = '1'
-        
-        # 处理前检查元素是否已包含翻译
-        if element.find(attrs={"data-hfit-translation-element-mark": "1"}):
-            # 清除所有已存在的翻译标记，避免重复翻译
-            for node in element.find_all(attrs={"data-hfit-translation-element-mark": "1"}):
-                node.decompose()
-        
-        # 获取元素的纯文本内容
-        text = element.get_text().strip()
-        
-        if not text:
-            return
-            
-        # 翻译文本
-        translated_text = self.translation_service.translate_text(text)
-        
-        # 创建并添加翻译包装器，启用深灰色样式
-        wrapper = self._create_translation_wrapper(translated_text, is_simple_mode=True)
-        element.append(wrapper)
-    
-    def _find_text_nodes(self, element, result):
-        """递归查找所有文本节点
-        
+        clone = BeautifulSoup(str(element), PARSER).find(element.name)
+        if clone is None:
+            # 个别标签在片段解析时可能被解析器调整，退回deepcopy保证正确性
+            clone = copy.deepcopy(element)
+        return clone
+
+    def _collect_text_pairs(self, element, pairs):
+        """收集所有(文本节点, 去除空白的文本)配对
+
+        在同一趟遍历里顺带取出strip后的字符串，调用方不需要再对
+        节点列表做第二趟提取。与_find_paragraphs一样用显式栈做DFS，
+        省去每个节点一个Python调用帧；子元素逆序入栈保证配对按
+        文档顺序产出。
+
         Args:
             element: 要处理的HTML元素
-            result: 收集文本节点的列表
-        """
-        for node in element.contents:
-            if isinstance(node, NavigableString) and not isinstance(node, Comment):
-                if node.strip():
-                    result.append(node)
-            elif isinstance(node, Tag):
-                if node.name.upper() not in HTML_TAGS_NO_TRANSLATE:
-                    self._find_text_nodes(node, result)
-    
-    def _translate_block(self, text_nodes, parent):
-        """翻译单个语义块，生成并插入翻译
-        
-        Args:
-            text_nodes: 文本节点列表
-            parent: 父元素
+            pairs: 收集(文本节点, 文本)元组的列表
         """
-        if not text_nodes:
+        # 快速通道：子树内没有不翻译标签时（清理后的语义块副本几乎
+        # 总是如此），直接用find_all(string=True)取出全部文本节点，
+        # 匹配循环在BS4内部完成；否则走显式栈遍历以跳过不翻译子树
+        if element.find(list(HTML_TAGS_NO_TRANSLATE)) is None:
+            for node in element.find_all(string=True):
+                if not isinstance(node, Comment):
+                    text = node.strip()
+                    if text:
+                        pairs.append((node, text))
             return
-        
-        # 提取文本
-        texts_to_translate = [node.string.strip() for node in text_nodes if node.string.strip()]
-        if not texts_to_translate:
-            return
-        
-        # 翻译文本
-        translated_texts = self.translation_service.translate_batch(texts_to_translate)
-        
-        if not translated_texts:
-            return
-        
-        # 创建翻译文本
-        text_clone = ' '.join(translated_texts)
-        
-        # 创建并插入翻译包装器到最后一个文本节点后
-        self._create_translation_wrapper(text_clone, text_nodes[-1])
-       
+
+        _isinstance = isinstance
+        _Tag = Tag
+        _NavigableString = NavigableString
+        _Comment = Comment
+        pairs_append = pairs.append
+
+        stack = list(reversed(element.contents))
+        stack_pop = stack.pop
+        stack_extend = stack.extend
+        while stack:
+            node = stack_pop()
+            if _isinstance(node, _NavigableString):
+                if not _isinstance(node, _Comment):
+                    text = node.strip()
+                    if text:
+                        pairs_append((node, text))
+            elif _isinstance(node, _Tag):
+                if node.name.lower() not in HTML_TAGS_NO_TRANSLATE:
+                    stack_extend(reversed(node.contents))
+    
     def _extract_semantic_blocks(self, paragraph):
         """从段落中提取待翻译的语义块
         
@@ -504,16 +665,13 @@ class HTMLProcessor:
             paragraph: 要提取语义块的段落元素
             
         Returns:
-            语义块列表，每个语义块是一个包含节点、最小公共祖先和结束标记的字典
+            语义块列表，元素为SemanticBlock（节点列表、最小公共祖先、结束标记）
         """
         semantic_blocks = []
-        
+
         # 记录当前处理的文本节点
         current_text_nodes = []
-        
-        # 记录已经被处理过的元素
-        processed_elements = set()
-        
+
         # 递归遍历元素，收集语义块节点
         def collect_nodes(element, is_top_level=False):
             # 如果是带有段落标记的元素（除了顶级段落本身），结束当前语义块
@@ -524,7 +682,8 @@ class HTMLProcessor:
                 return  # 对于段落标记的元素，我们不处理其内容
             
             # 如果是文本节点，添加到当前块
-            if isinstance(element, NavigableString) and not isinstance(element, Comment) and element.strip():
+            if (isinstance(element, NavigableString) and not isinstance(element, Comment)
+                    and element and not element.isspace()):
                 current_text_nodes.append(element)
             
             # 递归处理子元素
@@ -533,7 +692,7 @@ class HTMLProcessor:
                     collect_nodes(child)
                     
                 # 如果遍历完所有子元素后仍有未处理的文本节点，处理它们
-                if not is_top_level and current_text_nodes and element.name.upper() not in HTML_TAGS_INLINE_TEXT:
+                if not is_top_level and current_text_nodes and element.name.lower() not in HTML_TAGS_INLINE_TEXT:
                     finish_current_block(None)
         
         def finish_current_block(next_paragraph_element):
@@ -598,16 +757,13 @@ class HTMLProcessor:
                                   common_ancestor.append(end_marker)
                                   insert_location = end_marker
 
-                # 创建语义块记录
-                block = {
-                    "nodes": current_text_nodes.copy(),
-                    "common_ancestor": common_ancestor,
-                    "end_marker": insert_location
-                }
-                
-                semantic_blocks.append(block)
-                
-                # 清空当前文本节点列表
+                # 创建语义块记录：直接移交当前列表，随后重新绑定一个
+                # 新列表即可，省去copy()的一次全量复制
+                semantic_blocks.append(SemanticBlock(
+                    nodes=current_text_nodes,
+                    common_ancestor=common_ancestor,
+                    end_marker=insert_location
+                ))
                 current_text_nodes = []
         
         def find_minimum_common_ancestor(nodes):
@@ -621,42 +777,37 @@ class HTMLProcessor:
             """
             if not nodes:
                 return None
-                
+
             if len(nodes) == 1:
                 return nodes[0].parent
-                
-            # 获取第一个节点的所有祖先
-            first_node = nodes[0]
-            ancestors = []
-            parent = first_node.parent
-            
+
+            # 第一个节点的祖先链记录为 id -> 链上深度下标，
+            # 后续节点沿父链向上走，命中即得到该节点与链的交汇深度；
+            # 所有节点交汇深度的最大值（最靠近根）就是最小公共祖先
+            first_chain = []
+            ancestor_index = {}
+            parent = nodes[0].parent
+
             while parent:
-                ancestors.append(parent)
+                ancestor_index[id(parent)] = len(first_chain)
+                first_chain.append(parent)
                 parent = parent.parent
-                
-            # 对于每个后续节点，找到共同祖先
-            common_ancestor = None
-            
+
+            max_index = 0
             for node in nodes[1:]:
-                # 检查节点的每个祖先是否在ancestors列表中
                 current = node.parent
-                found = False
-                
-                while current and not found:
-                    if current in ancestors:
-                        # 找到共同祖先
-                        common_ancestor = current
-                        # 更新ancestors列表，只保留当前共同祖先及其祖先
-                        idx = ancestors.index(current)
-                        ancestors = ancestors[idx:]
-                        found = True
+                while current is not None and id(current) not in ancestor_index:
                     current = current.parent
-                    
-                if not found:
+
+                if current is None:
                     # 如果没有找到共同祖先，返回None
                     return None
-            
-            return common_ancestor
+
+                index = ancestor_index[id(current)]
+                if index > max_index:
+                    max_index = index
+
+            return first_chain[max_index]
             
         # 获取BeautifulSoup对象
         soup = paragraph.parent
@@ -672,112 +823,127 @@ class HTMLProcessor:
         
         return semantic_blocks
     
-    def _process_paragraph(self, paragraph):
-        """处理并翻译段落
-        
-        提取段落中的语义块，翻译每个语义块，并将翻译结果插入到原文中
-        
-        Args:
-            paragraph: 要处理的段落元素
-        """
-        # 提取段落中的语义块
-        semantic_blocks = self._extract_semantic_blocks(paragraph)
-        
-        # 如果没有语义块，直接返回
-        if not semantic_blocks:
-            return
-        
-        # 调试输出
-        if self.debug:
-            self.debug_print(f"[HTML处理] 在段落中找到 {len(semantic_blocks)} 个语义块")
-        
-        # 根据模式选择处理方法
-        if self.preserve_tags_structure:
-            # Advanced模式：保留HTML结构
-            self._process_paragraph_advanced(paragraph, semantic_blocks)
-        else:
-            # Simple模式：只翻译纯文本
-            self._process_paragraph_simple(paragraph, semantic_blocks)
-    
-    def _process_paragraph_simple(self, paragraph, semantic_blocks):
-        """Simple模式处理段落（不保留HTML结构）
-        
+    def _pack_batches(self, texts: List[str], max_chars: int = 4096) -> List[List[str]]:
+        """把文本列表贪心装箱为若干批次
+
+        每批同时受两个上限约束：条数不超过batch_size，总字符数不超过
+        max_chars。只按条数切分时，少数超长文本会把整批请求体撑大，
+        批内延迟由最长一条决定；字符上限让各批的请求体大小更均衡，
+        并发时尾延迟更可控。单条超过max_chars的文本独占一批。
+
         Args:
-            paragraph: 要处理的段落元素
-            semantic_blocks: 提取的语义块列表
+            texts: 要翻译的文本列表
+            max_chars: 单批的总字符数上限
+
+        Returns:
+            批次列表，展平后与输入顺序一致
         """
-        # 翻译每个语义块，不保留HTML结构
-        for block in semantic_blocks:
-            # 如果语义块中没有节点，跳过
-            if not block["nodes"]:
-                continue
-            
-            # 提取所有节点的文本，合并为一个完整的文本
-            all_text = ""
-            for node in block["nodes"]:
-                if node.string and node.string.strip():
-                    all_text += node.string.strip() + " "
-            
-            all_text = all_text.strip()
-            
-            # 如果没有文本需要翻译，跳过
-            if not all_text:
-                continue
-                
-            # 整体翻译文本
-            translated_text = self.translation_service.translate_text(all_text)
-            
-            # 如果翻译失败，跳过
-            if not translated_text:
-                continue
-            
-            # 创建并插入翻译包装器到语义块结束标记位置，启用深灰色样式
-            wrapper_element = self._create_translation_wrapper(translated_text, is_simple_mode=True)
-            if block.get("end_marker"):
-                block["end_marker"].insert_before(wrapper_element)
-            # 注意: 如果没有end_marker，简单模式下目前不会插入翻译。可能需要增加回退逻辑。
-    
-    def _process_paragraph_advanced(self, paragraph, semantic_blocks):
-        """Advanced模式处理段落（保留HTML结构）
-        
+        batches = []
+        current: List[str] = []
+        current_chars = 0
+        for text in texts:
+            if current and (len(current) >= self.batch_size or
+                            current_chars + len(text) > max_chars):
+                batches.append(current)
+                current = []
+                current_chars = 0
+            current.append(text)
+            current_chars += len(text)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _iter_translated_batches(self, texts: List[str]):
+        """分批调用翻译服务，按完成顺序产出每批结果
+
+        将收集到的全部文本段按条数和字符量装箱（见_pack_batches）。
+        单批直接同步调用；多批用线程池并发，完成一批就产出一批，
+        调用方据此可以把回填工作与仍在途的翻译请求重叠（流水线）。
+        批结果数量异常时用原文补齐，保证下标对齐。
+
         Args:
-            paragraph: 要处理的段落元素
-            semantic_blocks: 提取的语义块列表
+            texts: 要翻译的文本列表
+
+        Yields:
+            (起始下标, 批结果列表)元组，起始下标是该批第一条文本
+            在texts中的位置；产出顺序是批次完成顺序而非提交顺序
         """
-        # 这个函数在新的流程中不再直接调用，而是通过translate_html_content整体处理
-        # 保留此函数以维持兼容性，但内部实现被移到了translate_html_content中
-        pass
-    
-    def _is_ancestor(self, ancestor, descendant):
-        """检查一个元素是否是另一个元素的祖先
-        
+        batches = self._pack_batches(texts)
+        total_batches = len(batches)
+
+        # 各批次在全量列表中的起始下标
+        batch_starts = []
+        position = 0
+        for batch in batches:
+            batch_starts.append(position)
+            position += len(batch)
+
+        def fix_length(batch, batch_results):
+            # 如果批次结果数量异常，用原文补齐，保证下标对齐
+            if len(batch_results) != len(batch):
+                self.debug_print(f"[警告] 批次返回结果数量 ({len(batch_results)}) 与原文数量 ({len(batch)}) 不匹配")
+                batch_results = list(batch_results[:len(batch)]) + batch[len(batch_results):]
+            return batch_results
+
+        # 单批次时无需启动线程池
+        if total_batches <= 1:
+            if batches:
+                yield 0, fix_length(batches[0], self.translation_service.translate_batch_cached(batches[0]))
+            return
+
+        # 多批次时并发请求翻译服务
+        max_workers = min(self.max_concurrency, total_batches)
+        self.debug_print(f"[HTML处理] 使用 {max_workers} 个并发线程翻译 {total_batches} 个批次...")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_index = {
+                executor.submit(self.translation_service.translate_batch_cached, batch): batch_index
+                for batch_index, batch in enumerate(batches)
+            }
+            completed = 0
+            for future in as_completed(future_to_index):
+                batch_index = future_to_index[future]
+                try:
+                    batch_results = future.result()
+                except Exception as e:
+                    self.debug_print(f"[错误] 批次 {batch_index + 1} 翻译失败: {str(e)}，使用原文")
+                    batch_results = batches[batch_index]
+                completed += 1
+                self.debug_print(f"[HTML处理] 翻译批次完成: {completed}/{total_batches}")
+                yield batch_starts[batch_index], fix_length(batches[batch_index], batch_results)
+
+    def _translate_in_batches(self, texts: List[str]) -> List[str]:
+        """分批调用翻译服务并按原始顺序返回全部结果
+
+        _iter_translated_batches的同步汇总形式，供需要一次拿到
+        完整结果列表的调用方使用。
+
         Args:
-            ancestor: 可能的祖先元素
-            descendant: 可能的后代元素
-            
+            texts: 要翻译的文本列表
+
         Returns:
-            布尔值，表示ancestor是否是descendant的祖先
+            翻译后的文本列表，顺序与输入一致
         """
-        parent = descendant.parent
-        while parent:
-            if parent == ancestor:
-                return True
-            parent = parent.parent
-        return False
-    
-    def translate_html_content(self, html_content: str) -> str:
+        results: List[Optional[str]] = [None] * len(texts)
+        for start_index, batch_results in self._iter_translated_batches(texts):
+            results[start_index:start_index + len(batch_results)] = batch_results
+        return results
+
+    def translate_html_content(self, html_content) -> str:
         """翻译HTML内容并返回双语版本
-        
+
         Args:
-            html_content: HTML内容字符串
-            
+            html_content: HTML内容字符串或可读的文件对象
+                （BeautifulSoup两者都接受，传文件对象可避免
+                调用方先把整个文件读进内存）
+
         Returns:
             翻译后的HTML内容字符串
         """
-        # 解析HTML
+        # 解析HTML（PARSER在模块导入时确定，优先C实现的lxml）
         self.debug_print(f"[HTML处理] 正在解析HTML...")
         parse_start = time.time()
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, PARSER)
         parse_time = time.time() - parse_start
         self.debug_print(f"[HTML处理] HTML解析完成，耗时: {parse_time:.2f}秒")
         
@@ -814,8 +980,24 @@ class HTMLProcessor:
         
         # 用于存储所有需要翻译的文本和对应的原文
         all_texts_to_translate = []
-        text_to_original_map = {}  # 用于存储文本与原文的映射关系
-        processed_blocks = set()  # 用于记录已处理的语义块，避免重复处理
+        text_id_by_text = {}  # 原文 -> text_id，用于去重相同的文本段
+        block_records = []  # 每个待回填块的记录，顺序即收集顺序
+
+        def register_text(text):
+            """登记一个待翻译文本，相同文本只登记一次
+
+            Args:
+                text: 待翻译的文本
+
+            Returns:
+                该文本在all_texts_to_translate中的下标
+            """
+            text_id = text_id_by_text.get(text)
+            if text_id is None:
+                text_id = len(all_texts_to_translate)
+                text_id_by_text[text] = text_id
+                all_texts_to_translate.append(text)
+            return text_id
         
         # 从所有段落中提取需要翻译的文本
         for paragraph in paragraphs:
@@ -824,194 +1006,196 @@ class HTMLProcessor:
             if len(paragraph.get_text()) > 50:
                 text_preview += "..."
                 
+            # 快速通道：段落恰好只含一个文本子节点（文章类文档里
+            # <p>/<li>/<h*>的大多数情形）。此时没有结构需要保留，也
+            # 不需要结束标记定位——直接登记文本，回填时附加到段落末尾，
+            # 跳过整套语义块提取/公共祖先/结束标记插入流程
+            paragraph_contents = paragraph.contents
+            if len(paragraph_contents) == 1:
+                only_child = paragraph_contents[0]
+                if (isinstance(only_child, NavigableString)
+                        and not isinstance(only_child, Comment)
+                        and only_child and not only_child.isspace()):
+                    block_records.append({
+                        "type": "text_block",
+                        "paragraph": paragraph,
+                        "end_marker": None,
+                        "text_id": register_text(only_child.strip())
+                    })
+                    continue
+
             # 根据模式选择提取方法
             if self.preserve_tags_structure:
                 # Advanced模式: 提取保留HTML结构的文本
                 semantic_blocks = self._extract_semantic_blocks(paragraph)
-                for block_index, block in enumerate(semantic_blocks):
-                    # 创建一个唯一的块标识
-                    block_id = f"{id(paragraph)}_{block_index}"
-                    
-                    # 如果这个块已经被处理过，跳过
-                    if block_id in processed_blocks:
-                        continue
-                        
-                    # 标记这个块已处理
-                    processed_blocks.add(block_id)
-                    
-                    if not block["nodes"]:
+                for block in semantic_blocks:
+                    if not block.nodes:
                         continue
-                        
+
                     # 高级模式提取文本
                     # 使用已经找到的最小公共祖先
-                    common_ancestor = block["common_ancestor"]
+                    common_ancestor = block.common_ancestor
                     
                     if common_ancestor:
-                        # 复制共同祖先及其内容
-                        ancestor_copy = copy.deepcopy(common_ancestor)
+                        # 复制共同祖先及其内容（序列化+重解析，比deepcopy快得多）
+                        ancestor_copy = self._clone_element(common_ancestor)
                         
                         # 找出需要保留的文本节点
-                        nodes_to_keep = set(block["nodes"])
+                        nodes_to_keep = set(block.nodes)
                         
                         # 清理不需要的节点
                         self._clean_copy_for_translation(ancestor_copy, nodes_to_keep)
                         
-                        # 提取要翻译的纯文本
-                        text_nodes = []
-                        self._find_text_nodes(ancestor_copy, text_nodes)
-                        
-                        # 创建文本节点映射，用于应用翻译结果
-                        node_map = {}
-                        all_block_texts = []
-                        
-                        for node_index, node in enumerate(text_nodes):
-                            text = node.string.strip()
-                            if text:
-                                # 为这个文本创建一个唯一ID
-                                text_id = len(all_texts_to_translate)
-                                node_map[text_id] = node
-                                all_block_texts.append(text_id)
-                                
-                                # 添加到待翻译文本列表
-                                all_texts_to_translate.append(text)
-                        
+                        # 一趟遍历提取要翻译的(文本节点, 文本)配对
+                        pairs = []
+                        self._collect_text_pairs(ancestor_copy, pairs)
+
+                        # 创建(text_id, 文本节点)配对列表，用于应用翻译结果
+                        # （相同文本复用同一个text_id）
+                        node_pairs = [(register_text(text), node) for node, text in pairs]
+
                         # 如果有文本需要翻译，记录到映射中
-                        if all_block_texts:
-                            block_key = f"block_{block_id}"
-                            text_to_original_map[block_key] = {
+                        if node_pairs:
+                            block_records.append({
                                 "type": "advanced_block",
                                 "paragraph": paragraph,
-                                "block": block,
+                                "end_marker": block.end_marker,
                                 "ancestor_copy": ancestor_copy,
-                                "node_map": node_map,
-                                "text_ids": all_block_texts
-                            }
+                                "node_pairs": node_pairs
+                            })
                     else:
                         # 如果找不到共同祖先，回退到简单模式
-                        all_block_text = ""
-                        for node in block["nodes"]:
-                            if node.string and node.string.strip():
-                                all_block_text += node.string.strip() + " "
-                        
-                        all_block_text = all_block_text.strip()
+                        # 先收集片段再一次join：+=拼接在最坏情况下是O(N²)的
+                        # Unicode复制，join保证线性且不产生中间串
+                        parts = []
+                        for node in block.nodes:
+                            # node.string每次访问都有属性查找开销，strip()又会
+                            # 整串扫描并分配新串——各做一次后复用
+                            s = node.string
+                            text = s.strip() if s else ""
+                            if text:
+                                parts.append(text)
+
+                        all_block_text = " ".join(parts)
                         if all_block_text:
-                            text_id = len(all_texts_to_translate)
-                            all_texts_to_translate.append(all_block_text)
-                            
-                            block_key = f"block_{block_id}"
-                            text_to_original_map[block_key] = {
+                            text_id = register_text(all_block_text)
+
+                            block_records.append({
                                 "type": "simple_block",
                                 "paragraph": paragraph,
-                                "block": block,
+                                "end_marker": block.end_marker,
                                 "text_id": text_id
-                            }
+                            })
             else:
                 # Simple模式: 只提取纯文本
                 semantic_blocks = self._extract_semantic_blocks(paragraph)
-                for block_index, block in enumerate(semantic_blocks):
-                    # 创建一个唯一的块标识
-                    block_id = f"{id(paragraph)}_{block_index}"
-                    
-                    # 如果这个块已经被处理过，跳过
-                    if block_id in processed_blocks:
-                        continue
-                        
-                    # 标记这个块已处理
-                    processed_blocks.add(block_id)
-                    
-                    if not block["nodes"]:
+                for block in semantic_blocks:
+                    if not block.nodes:
                         continue
-                        
+
                     # 提取所有节点的文本
-                    all_text = ""
-                    for node in block["nodes"]:
-                        if node.string and node.string.strip():
-                            all_text += node.string.strip() + " "
-                    
-                    all_text = all_text.strip()
+                    # 同上：收集片段后一次join，避免+=的重复复制
+                    parts = []
+                    for node in block.nodes:
+                        s = node.string
+                        text = s.strip() if s else ""
+                        if text:
+                            parts.append(text)
+
+                    all_text = " ".join(parts)
                     if all_text:
-                        text_id = len(all_texts_to_translate)
-                        all_texts_to_translate.append(all_text)
-                        
-                        block_key = f"block_{block_id}"
-                        text_to_original_map[block_key] = {
+                        text_id = register_text(all_text)
+
+                        block_records.append({
                             "type": "simple_block",
                             "paragraph": paragraph,
-                            "block": block,
+                            "end_marker": block.end_marker,
                             "text_id": text_id
-                        }
+                        })
         
         collect_time = time.time() - collect_start
-        self.debug_print(f"[HTML处理] 共收集到 {len(all_texts_to_translate)} 个文本片段需要翻译，耗时: {collect_time:.2f}秒")
-        
-        # 一次性批量翻译所有文本
-        if all_texts_to_translate:
-            self.debug_print(f"[HTML处理] 开始批量翻译所有文本...")
-            translate_start = time.time()
-            all_translated_texts = self.translation_service.translate_batch(all_texts_to_translate)
-            translate_time = time.time() - translate_start
-            self.debug_print(f"[HTML处理] 翻译完成，翻译了 {len(all_translated_texts)} 个文本，耗时: {translate_time:.2f}秒")
-        else:
-            all_translated_texts = []
-            self.debug_print(f"[HTML处理] 没有文本需要翻译")
-        
-        # 应用翻译结果到文档中
-        self.debug_print(f"\n[HTML处理] 开始应用翻译结果...")
+        self.debug_print(f"[HTML处理] 共收集到 {len(all_texts_to_translate)} 个去重后的文本片段需要翻译，耗时: {collect_time:.2f}秒")
+        
+        # 翻译与回填组成流水线：块按所需的最大text_id排序，翻译批次
+        # 每完成一段连续前缀就立即回填已就绪的块——墙上时间趋近于
+        # max(翻译, 回填)加一个批次的延迟，而不是两者之和。
+        # 回填仍然全部发生在主线程（批次完成的消费循环体内），
+        # BS4树的读写不跨线程——BS4/lxml的树结构不是写安全的
+        self.debug_print(f"\n[HTML处理] 开始流水线翻译并应用结果...")
         apply_start = time.time()
+
+        all_translated_texts: List[Optional[str]] = [None] * len(all_texts_to_translate)
         
-        # 跟踪已处理的段落
-        processed_paragraphs = set()
+        # 跟踪已处理的段落：存id()整数而不是Tag对象——Tag的哈希/相等
+        # 比较要走属性与子树，整数集合只比较机器字
+        processed_paragraph_ids = set()
+
+        # 待插入的(结束标记, 包装器)按父元素分组收集，循环结束后统一
+        # 插入：同一父元素下的标记下标只需扫描一次子节点列表就能全部
+        # 拿到，代替每块一次insert_before内部的线性定位
+        pending_inserts: Dict[int, tuple] = {}
+
+        def insert_before_marker(end_marker, wrapper_element):
+            parent = end_marker.parent
+            if parent is None:
+                end_marker.insert_before(wrapper_element)
+                return
+            entry = pending_inserts.get(id(parent))
+            if entry is None:
+                entry = pending_inserts[id(parent)] = (parent, [])
+            entry[1].append((end_marker, wrapper_element))
         
-        # 实际应用翻译结果
-        for i, (block_key, block_info) in enumerate(text_to_original_map.items()):
-            # 显示进度
-            progress = (i + 1) / len(text_to_original_map) * 100
-            if i % 10 == 0 or i == len(text_to_original_map) - 1:  # 只在每10个或最后一个时显示进度
-                self.debug_print(f"[HTML处理] 应用翻译进度: {progress:.1f}% ({i+1}/{len(text_to_original_map)})")
-            
+        def apply_block(block_index, block_info):
+            """把单个块的翻译结果写回文档树"""
             block_type = block_info["type"]
             paragraph = block_info["paragraph"]
-            block = block_info["block"]
-            
+            # 结束标记在收集阶段就提升到记录顶层，这里一次取出，
+            # 不再经过SemanticBlock的二次间接
+            end_marker = block_info["end_marker"]
+
             # 根据块类型处理翻译
             if block_type == "advanced_block":
                 # 高级模式块
                 ancestor_copy = block_info["ancestor_copy"]
-                node_map = block_info["node_map"]
-                text_ids = block_info["text_ids"]
-                
-                # 应用翻译到每个节点
-                for text_id in text_ids:
+
+                # 应用翻译到每个节点：node_pairs里存的就是NavigableString
+                # 本身，直接replace_with，省去每个节点一次.string属性解析
+                for text_id, node in block_info["node_pairs"]:
                     if text_id < len(all_translated_texts):
-                        node = node_map[text_id]
-                        translated_text = all_translated_texts[text_id]
-                        node.string.replace_with(translated_text)
+                        node.replace_with(all_translated_texts[text_id])
                 
                 # 将处理后的HTML转为字符串
                 translated_html = ancestor_copy.decode_contents()
                 
                 # 创建并插入翻译包装器到结束标记位置
                 wrapper_element = self._create_translation_wrapper(translated_html)
-                end_marker = block.get("end_marker")
                 if end_marker:
-                    end_marker.insert_before(wrapper_element)
+                    insert_before_marker(end_marker, wrapper_element)
                 else:
                     # Fallback logic (e.g., append to paragraph? Log error?)
-                    self.debug_print(f"[HTML处理] 警告: 块 {block_key} 缺少结束标记，尝试回退插入。")
+                    self.debug_print(f"[HTML处理] 警告: 块 {block_index} 缺少结束标记，尝试回退插入。")
                     # 使用 paragraph 作为回退插入点
                     paragraph.append(wrapper_element)
+            elif block_type == "text_block":
+                # 单文本节点快速通道：无结束标记，直接附加到段落末尾
+                # （与原路径中"标记插在最后一个文本节点之后"的位置一致）
+                text_id = block_info["text_id"]
+                if text_id < len(all_translated_texts):
+                    wrapper_element = self._create_translation_wrapper(
+                        all_translated_texts[text_id],
+                        is_simple_mode=not self.preserve_tags_structure)
+                    paragraph.append(wrapper_element)
             elif block_type == "simple_block":
                 # 简单模式块
                 text_id = block_info["text_id"]
                 if text_id < len(all_translated_texts):
                     translated_text = all_translated_texts[text_id]
                     wrapper_element = self._create_translation_wrapper(translated_text, is_simple_mode=True)
-                    end_marker = block.get("end_marker")
                     if end_marker:
-                        end_marker.insert_before(wrapper_element)
+                        insert_before_marker(end_marker, wrapper_element)
                     else:
                         # Fallback logic
-                        self.debug_print(f"[HTML处理] 警告: 块 {block_key} 缺少结束标记，尝试回退插入。")
+                        self.debug_print(f"[HTML处理] 警告: 块 {block_index} 缺少结束标记，尝试回退插入。")
                         # 使用 paragraph 作为回退插入点
                         paragraph.append(wrapper_element)
             
@@ -1019,91 +1203,195 @@ class HTMLProcessor:
             paragraph['data-hfit-paragraph'] = '1'
             
             # 如果段落还没有被计数，则增加处理计数并将段落添加到已处理集合中
-            if paragraph not in processed_paragraphs:
-                processed_paragraphs.add(paragraph)
+            paragraph_id = id(paragraph)
+            if paragraph_id not in processed_paragraph_ids:
+                processed_paragraph_ids.add(paragraph_id)
                 self.processed_count += 1
-        
+
+        def block_max_text_id(block_info):
+            # 块回填所需的最大text_id（advanced块引用多条文本）
+            if block_info["type"] == "advanced_block":
+                return max(text_id for text_id, _ in block_info["node_pairs"])
+            return block_info["text_id"]
+
+        # 回填队列按所需最大text_id排序，就绪前缀推进时从队头消费
+        apply_queue = sorted(
+            ((block_max_text_id(block_info), block_index, block_info)
+             for block_index, block_info in enumerate(block_records)),
+            key=lambda entry: entry[0])
+        # 块总数和文本总数在回填期间不变，提出循环外，
+        # 热循环里不再每次迭代各做一次len()调用
+        total_blocks = len(apply_queue)
+        total_texts = len(all_translated_texts)
+        applied = 0
+        ready_count = 0  # 已连续就绪的翻译结果前缀长度
+
+        def apply_ready_blocks():
+            # 回填所有所需文本已全部就绪的块
+            nonlocal applied
+            while applied < total_blocks and apply_queue[applied][0] < ready_count:
+                _, block_index, block_info = apply_queue[applied]
+                apply_block(block_index, block_info)
+                applied += 1
+                # 显示进度：每10个或最后一个时输出（流水线下按回填计数驱动）
+                if self.debug and (applied % 10 == 0 or applied == total_blocks):
+                    progress = applied / total_blocks * 100
+                    self.debug_print(f"[HTML处理] 应用翻译进度: {progress:.1f}% ({applied}/{total_blocks})")
+
+        if all_texts_to_translate:
+            self.debug_print(f"[HTML处理] 开始批量翻译所有文本...")
+            translate_start = time.time()
+            for start_index, batch_results in self._iter_translated_batches(all_texts_to_translate):
+                all_translated_texts[start_index:start_index + len(batch_results)] = batch_results
+                # 推进连续就绪前缀：乱序先完成的靠后批次暂存，等缺口补齐
+                while (ready_count < total_texts and
+                       all_translated_texts[ready_count] is not None):
+                    ready_count += 1
+                apply_ready_blocks()
+            translate_time = time.time() - translate_start
+            self.debug_print(f"[HTML处理] 翻译完成，翻译了 {len(all_translated_texts)} 个文本，耗时: {translate_time:.2f}秒")
+        else:
+            self.debug_print(f"[HTML处理] 没有文本需要翻译")
+
+        # 兜底：正常情况下前缀已覆盖全部文本，这里清空可能剩余的块
+        ready_count = total_texts + 1
+        apply_ready_blocks()
+
+        # 统一执行分组后的插入。下标按从大到小的顺序插入，已插入的
+        # 包装器不会使更靠前的标记下标失效
+        for parent, marker_wrappers in pending_inserts.values():
+            if len(marker_wrappers) == 1:
+                end_marker, wrapper_element = marker_wrappers[0]
+                end_marker.insert_before(wrapper_element)
+                continue
+
+            index_by_marker_id = {}
+            marker_ids = {id(end_marker) for end_marker, _ in marker_wrappers}
+            for index, child in enumerate(parent.contents):
+                if id(child) in marker_ids:
+                    index_by_marker_id[id(child)] = index
+
+            marker_wrappers.sort(
+                key=lambda item: index_by_marker_id.get(id(item[0]), -1), reverse=True)
+            for end_marker, wrapper_element in marker_wrappers:
+                index = index_by_marker_id.get(id(end_marker))
+                if index is None:
+                    # 扫描未命中（标记已被挪动等异常情况），退回逐个插入
+                    end_marker.insert_before(wrapper_element)
+                else:
+                    parent.insert(index, wrapper_element)
+
         apply_time = time.time() - apply_start
         self.debug_print(f"[HTML处理] 应用翻译结果完成，耗时: {apply_time:.2f}秒")
         
         return str(soup)
     
-    # Helper function for recursive cleaning
-    def _clean_copy_recursive(self, element, nodes_to_keep_with_ancestors):
-        """Recursively cleans children of an element."""
-        nodes_to_remove = []
-        for child in list(element.contents): # Iterate over a copy
-            if child not in nodes_to_keep_with_ancestors:
-                # If a child node (tag or non-empty text) is not in the keep set, mark for removal.
-                # Also skip end markers during cleaning.
-                if (isinstance(child, Tag) and not child.has_attr('data-hfit-block-end-marker')) or \
-                   (isinstance(child, NavigableString) and child.strip()):
-                     nodes_to_remove.append(child)
-            elif isinstance(child, Tag) and not child.has_attr('data-hfit-block-end-marker'):
-                 # If a tag is in the keep set (and not an end marker), recursively clean its children
-                 self._clean_copy_recursive(child, nodes_to_keep_with_ancestors)
-
-        # Remove marked nodes
-        for node in nodes_to_remove:
-            # Ensure it's still a direct child before removing
-            if node.parent == element:
-                 node.extract()
+    def _clean_copy_recursive(self, element, nodes_to_keep_with_ancestors, end_marker_ids):
+        """自底向上清理元素的子节点，返回元素清理后是否为空
+
+        同一趟后序遍历里完成两件事：丢弃不在保留集合中的节点，并把
+        清理后变空的子标签顺手摘除。原来的实现分两趟独立遍历
+        （本方法加_clean_empty_tags），每个节点的指针追逐和Python层
+        调用都要做两遍。
+
+        与_find_paragraphs一样用带ENTER/EXIT阶段的显式栈代替按节点
+        递归：EXIT阶段子元素已全部处理完，通过empty_by_id读取各子
+        标签的清空结果。
+
+        Args:
+            element: 要清理的元素
+            nodes_to_keep_with_ancestors: 保留的文本节点及其全部祖先的集合
+            end_marker_ids: 子树内全部结束标记元素的id()集合
+                （由调用方一次find_all预收集，代替每个标签两次has_attr）
+
+        Returns:
+            布尔值，元素清理后是否不再包含实质内容
+        """
+        _isinstance = isinstance
+        _Tag = Tag
+        _NavigableString = NavigableString
+        keep_set = nodes_to_keep_with_ancestors
+        empty_by_id = {}
+
+        _ENTER, _EXIT = 0, 1
+        stack = [(element, _ENTER)]
+        stack_append = stack.append
+        stack_pop = stack.pop
+
+        while stack:
+            el, phase = stack_pop()
+
+            if phase == _ENTER:
+                stack_append((el, _EXIT))
+                for child in el.contents:
+                    if (_isinstance(child, _Tag)
+                            and id(child) not in end_marker_ids
+                            and child in keep_set):
+                        stack_append((child, _ENTER))
+                continue
+
+            nodes_to_remove = []
+            # 摘除统一放在循环之后，循环中不修改el.contents，
+            # 因此可以直接迭代而不必先整体复制一份
+            for child in el.contents:
+                if _isinstance(child, _Tag):
+                    if id(child) in end_marker_ids:
+                        # 结束标记本身是空标签，原第二趟清理同样会移除它
+                        nodes_to_remove.append(child)
+                    elif child not in keep_set:
+                        nodes_to_remove.append(child)
+                    elif empty_by_id.get(id(child)):
+                        # 保留集合中的标签清理后变空，一并摘除
+                        nodes_to_remove.append(child)
+                elif (child not in keep_set and
+                      _isinstance(child, _NavigableString) and child and not child.isspace()):
+                    nodes_to_remove.append(child)
+
+            for node in nodes_to_remove:
+                # Ensure it's still a direct child before removing
+                if node.parent == el:
+                    node.extract()
+
+            contents = el.contents
+            empty_by_id[id(el)] = len(contents) == 0 or (len(contents) == 1 and
+                _isinstance(contents[0], _NavigableString) and
+                (not contents[0] or contents[0].isspace()))
+
+        return empty_by_id[id(element)]
 
     def _clean_copy_for_translation(self, ancestor_copy, nodes_to_keep):
         """Clean the copied common ancestor to keep only the specified nodes and their parent tags."""
         nodes_to_keep_set = set(nodes_to_keep)
-        nodes_to_keep_with_ancestors = set(nodes_to_keep_set)
-
-        # Add all ancestors of the nodes_to_keep up to the ancestor_copy itself
-        # Fix: Handle set access correctly
         if not nodes_to_keep_set:
             # If there are no nodes to keep, we shouldn't be here, but handle gracefully
             return
 
-        # Get an arbitrary node to start ancestor traversal
-        start_node = next(iter(nodes_to_keep_set))
+        nodes_to_keep_with_ancestors = set(nodes_to_keep_set)
 
-        # The common ancestor logic should ideally happen before deepcopying,
-        # or we need a robust way to map original nodes to copied nodes.
-        # Sticking with the potentially flawed assumption for now to fix the TypeError.
+        # 一趟后序遍历标记所有保留节点的祖先：子树中含保留节点的元素
+        # 在回溯时加入集合，整体O(N)；代替原来对每个保留节点各走一遍
+        # 父链、再用any()复查根节点的O(K·D)做法
+        def mark(element):
+            keep = element in nodes_to_keep_set
+            for child in element.contents:
+                if isinstance(child, Tag):
+                    if mark(child):
+                        keep = True
+                elif child in nodes_to_keep_set:
+                    keep = True
+            if keep:
+                nodes_to_keep_with_ancestors.add(element)
+            return keep
 
-        for node in nodes_to_keep_set:
-            # Assuming nodes_to_keep contains references within ancestor_copy (POTENTIALLY WRONG)
-            parent = node.parent
-            while parent and parent != ancestor_copy.parent:
-                nodes_to_keep_with_ancestors.add(parent)
-                if parent == ancestor_copy:
-                    break
-                parent = parent.parent
-        # Ensure ancestor_copy itself is included if it's an ancestor of any kept node
-        # This check might be redundant if the above loop works correctly, but adds safety
-        if any(self._is_ancestor(ancestor_copy, node) for node in nodes_to_keep_set):
-             nodes_to_keep_with_ancestors.add(ancestor_copy)
+        mark(ancestor_copy)
 
+        # 一次find_all（解析器层的C级属性扫描）预收集子树内全部结束
+        # 标记，清理遍历中用id成员判断代替逐标签的has_attr调用
+        end_marker_ids = {
+            id(marker)
+            for marker in ancestor_copy.find_all(attrs={'data-hfit-block-end-marker': True})
+        }
 
         # Start the recursive cleaning from the ancestor_copy
-        self._clean_copy_recursive(ancestor_copy, nodes_to_keep_with_ancestors)
-
-        # Final pass to remove potentially empty containers that might remain
-        self._clean_empty_tags(ancestor_copy)
-
-
-    def _clean_empty_tags(self, element):
-        """清理空标签
-        
-        Args:
-            element: 要清理的元素
-        """
-        to_remove = []
-        for child in element.contents:
-            if isinstance(child, Tag):
-                # 递归处理子元素
-                self._clean_empty_tags(child)
-                # 如果处理后变成空标签，标记删除
-                if len(child.contents) == 0 or (len(child.contents) == 1 and 
-                    isinstance(child.contents[0], NavigableString) and not child.contents[0].strip()):
-                    to_remove.append(child)
-        
-        # 删除标记的元素
-        for node in to_remove:
-            node.extract() 
\ No newline at end of file
+        # （清理和空标签摘除已融合为一趟，见_clean_copy_recursive）
+        self._clean_copy_recursive(ancestor_copy, nodes_to_keep_with_ancestors, end_marker_ids)
\ No newline at end of file
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+hfit 的翻译缓存模块
+
+这个模块实现了两级翻译缓存:
+1. 进程内LRU热缓存 - 命中时零开销
+2. 持久化缓存 - 跨运行复用翻译结果，默认SQLite文件；
+   设置了 REDIS_URL 环境变量且安装了redis包时改用Redis，
+   方便多台机器共享同一份缓存
+
+很多HTML文档会重复出现相同的短文本（导航链接、按钮标签等），
+缓存可以省掉这些文本的网络往返。
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# 可选的Redis后端：仅当设置了REDIS_URL时才会用到
+try:
+    import redis as _redis_module
+except ImportError:
+    _redis_module = None
+
+# 进程内热缓存的默认容量
+DEFAULT_MEMORY_CACHE_SIZE = 100_000
+
+# 持久化缓存条目的默认有效期（14天）：
+# 网页翻译接口的译文质量会随模型更新而变化，过期重译避免陈旧译文无限存活
+DEFAULT_TTL_SECONDS = 14 * 24 * 3600
+
+
+def _hash_text(text: str) -> str:
+    """计算文本的缓存键哈希
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        十六进制哈希字符串
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class TranslationCache:
+    """两级翻译缓存（内存LRU + SQLite）
+
+    缓存键由 (服务名, 源语言, 目标语言, 文本哈希) 组成，
+    同一文本在不同服务或语言方向下互不干扰。
+    """
+
+    def __init__(self, cache_path: str, service_name: str,
+                 source_language: str, target_language: str,
+                 memory_cache_size: int = DEFAULT_MEMORY_CACHE_SIZE,
+                 ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        """初始化翻译缓存
+
+        Args:
+            cache_path: SQLite缓存文件路径（支持~展开），
+                设置了REDIS_URL时忽略，改用Redis
+            service_name: 翻译服务名称
+            source_language: 源语言代码
+            target_language: 目标语言代码
+            memory_cache_size: 进程内热缓存的最大条目数
+            ttl_seconds: 持久化缓存条目的有效期（秒）
+        """
+        self.service_name = service_name
+        self.source_language = source_language
+        self.target_language = target_language
+        self.memory_cache_size = memory_cache_size
+        self.ttl_seconds = ttl_seconds
+
+        # 进程内LRU热缓存: 文本 -> 译文
+        self._memory_cache: OrderedDict = OrderedDict()
+
+        # SQLite连接会被多个翻译线程共享，用锁串行化访问
+        self._db_lock = threading.Lock()
+
+        self._conn = None
+        self._redis = None
+
+        redis_url = os.environ.get('REDIS_URL')
+        if redis_url and _redis_module is not None:
+            # Redis自带TTL，setex写入时设置过期时间即可
+            self._redis = _redis_module.Redis.from_url(redis_url)
+            return
+
+        cache_path = os.path.expanduser(cache_path)
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "  service TEXT NOT NULL,"
+            "  src TEXT NOT NULL,"
+            "  tgt TEXT NOT NULL,"
+            "  hash TEXT NOT NULL,"
+            "  translated TEXT NOT NULL,"
+            "  ts INTEGER NOT NULL,"
+            "  PRIMARY KEY (service, src, tgt, hash)"
+            ")"
+        )
+        # 启动时顺手清掉过期条目，查询路径只需比较时间戳
+        self._conn.execute(
+            "DELETE FROM translations WHERE ts <= ?",
+            (int(time.time()) - self.ttl_seconds,)
+        )
+        self._conn.commit()
+
+    def _redis_key(self, text_hash: str) -> str:
+        """构造Redis缓存键"""
+        return (f"hfit:v1:{self.service_name}:{self.source_language}:"
+                f"{self.target_language}:{text_hash}")
+
+    def _memory_get(self, text: str) -> Optional[str]:
+        """查询内存热缓存，命中时移到LRU末尾"""
+        translated = self._memory_cache.get(text)
+        if translated is not None:
+            self._memory_cache.move_to_end(text)
+        return translated
+
+    def _memory_put(self, text: str, translated: str):
+        """写入内存热缓存，超出容量时淘汰最久未用的条目"""
+        self._memory_cache[text] = translated
+        self._memory_cache.move_to_end(text)
+        while len(self._memory_cache) > self.memory_cache_size:
+            self._memory_cache.popitem(last=False)
+
+    def get_many(self, texts: List[str]) -> Dict[str, str]:
+        """批量查询缓存
+
+        Args:
+            texts: 要查询的文本列表
+
+        Returns:
+            命中的 {文本: 译文} 字典，未命中的文本不在其中
+        """
+        hits: Dict[str, str] = {}
+        missing: List[str] = []
+
+        for text in texts:
+            translated = self._memory_get(text)
+            if translated is not None:
+                hits[text] = translated
+            else:
+                missing.append(text)
+
+        if missing:
+            hash_to_text = {_hash_text(text): text for text in missing}
+            hashes = list(hash_to_text.keys())
+
+            if self._redis is not None:
+                # Redis不可用时静默降级为未命中，不影响翻译本身
+                try:
+                    values = self._redis.mget([self._redis_key(h) for h in hashes])
+                except Exception:
+                    values = [None] * len(hashes)
+                for text_hash, value in zip(hashes, values):
+                    if value is not None:
+                        text = hash_to_text[text_hash]
+                        translated = value.decode('utf-8')
+                        hits[text] = translated
+                        self._memory_put(text, translated)
+                return hits
+
+            placeholders = ",".join("?" * len(hashes))
+            cutoff = int(time.time()) - self.ttl_seconds
+            with self._db_lock:
+                rows = self._conn.execute(
+                    f"SELECT hash, translated FROM translations "
+                    f"WHERE service=? AND src=? AND tgt=? AND ts > ? AND hash IN ({placeholders})",
+                    [self.service_name, self.source_language, self.target_language, cutoff] + hashes
+                ).fetchall()
+            for text_hash, translated in rows:
+                text = hash_to_text[text_hash]
+                hits[text] = translated
+                self._memory_put(text, translated)
+
+        return hits
+
+    def set_many(self, pairs: List[Tuple[str, str]]):
+        """批量写入缓存
+
+        Args:
+            pairs: (原文, 译文) 元组列表
+        """
+        if not pairs:
+            return
+
+        if self._redis is not None:
+            # Redis不可用时静默放弃写入，不影响翻译本身
+            try:
+                pipe = self._redis.pipeline()
+                for text, translated in pairs:
+                    self._memory_put(text, translated)
+                    pipe.setex(self._redis_key(_hash_text(text)),
+                               self.ttl_seconds, translated)
+                pipe.execute()
+            except Exception:
+                pass
+            return
+
+        now = int(time.time())
+        rows = []
+        for text, translated in pairs:
+            self._memory_put(text, translated)
+            rows.append((self.service_name, self.source_language,
+                         self.target_language, _hash_text(text), translated, now))
+
+        with self._db_lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(service, src, tgt, hash, translated, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def close(self):
+        """关闭底层持久化缓存连接"""
+        if self._redis is not None:
+            try:
+                self._redis.close()
+            except Exception:
+                pass
+            return
+        with self._db_lock:
+            self._conn.close()
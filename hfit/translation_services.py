@@ -10,15 +10,180 @@ hfit 的翻译服务模块
 4. ArgosTranslate本地翻译 (离线版)
 """
 
+import os
 import time
 import json
 import re
+import html
 import urllib.parse
+import threading
 import requests
+from requests.adapters import HTTPAdapter, Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional
 import sys
-from bs4 import BeautifulSoup
-from argostranslate import translate, package
+
+from hfit.translation_cache import TranslationCache
+
+# argostranslate（连带CTranslate2和sentencepiece）的导入开销在数百毫秒级，
+# 且只有选择argos服务时才用得到，推迟到ArgosTranslationService初始化时导入
+
+# 可选的orjson加速：JSON解析是大批量翻译时响应处理的主要CPU开销，
+# orjson（C实现）比标准库快数倍；未安装时回退到标准库json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def create_http_session(headers=None) -> requests.Session:
+    """创建带连接池的requests会话
+
+    复用同一个会话可以保持HTTP keep-alive连接，
+    避免每次翻译请求都重新进行TCP+TLS握手。
+    连接池层面自动重试瞬时故障（429/5xx及连接错误），
+    带指数退避，避免把可恢复的网络抖动当作翻译失败。
+
+    Args:
+        headers: 挂到会话上的默认请求头，每次请求自动携带，
+            无需在调用点重复传入；单次请求传headers=仍可覆盖
+
+    Returns:
+        requests.Session: 配置好连接池的会话实例
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+# 按服务名共享的HTTP会话：同一进程内反复构造同名服务
+# （多线程、多批次场景）时复用同一个连接池，而不是各开一套
+_SESSION_CACHE: dict = {}
+_SESSION_CACHE_LOCK = threading.Lock()
+
+
+def get_shared_session(name: str, headers=None) -> requests.Session:
+    """获取（必要时创建）按服务名共享的HTTP会话
+
+    Args:
+        name: 服务名称，作为共享键
+        headers: 首次创建时挂到会话上的默认请求头
+
+    Returns:
+        requests.Session: 该服务名下共享的会话实例
+    """
+    session = _SESSION_CACHE.get(name)
+    if session is None:
+        with _SESSION_CACHE_LOCK:
+            session = _SESSION_CACHE.get(name)
+            if session is None:
+                session = create_http_session(headers)
+                _SESSION_CACHE[name] = session
+    return session
+
+
+def close_shared_sessions():
+    """关闭并清空所有共享会话（进程收尾时调用）"""
+    with _SESSION_CACHE_LOCK:
+        for session in _SESSION_CACHE.values():
+            session.close()
+        _SESSION_CACHE.clear()
+
+# 翻译路径上按原文兜底的异常集合：网络错误（连接池重试耗尽后）
+# 和响应解析错误。其他异常属于程序缺陷，应当冒泡而不是被当作翻译失败吞掉
+_TRANSLATE_ERRORS = (requests.RequestException, ValueError, KeyError, IndexError, TypeError)
+
+# 进度条的满/空两段预先构建，重绘时切片拼接即可（切片是C层memcpy，
+# 比每次用'*'重新生成两个字符串便宜）
+_BAR_LENGTH = 20
+_BAR_FULL = '█' * _BAR_LENGTH
+_BAR_EMPTY = '░' * _BAR_LENGTH
+
+# 各翻译服务的接口地址（查询参数交给requests编码，不再手工拼URL）
+_GOOGLE_TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+_BING_TRANSLATE_URL = "https://www.bing.com/ttranslatev3"
+_YANDEX_TRANSLATE_URL = "https://translate.yandex.net/api/v1/tr.json/translate"
+
+# Yandex批量翻译用的连接标签（format=html模式下引擎原样保留<wbr>）
+_WBR = "<wbr>"
+
+# 批量翻译时串接多个文本用的哨兵分隔符：
+# 选用翻译引擎不会改写的纯符号串，独立成行降低被并入相邻句子的概率
+_BATCH_SENTINEL = "\n@@@\n"
+_RE_SENTINEL_SPLIT = re.compile(r'\s*@@@\s*')
+
+# ArgosTranslate单次批量调用串接的文本数量上限：
+# 块太大时模型对长输入的耗时增长会抵消摊薄掉的固定开销
+_ARGOS_CHUNK_SIZE = 20
+
+# 进程级共享的Argos翻译对象LRU缓存，按语言对为键：
+# 每个翻译对象持有完整的模型权重，多语言对任务中无限持有
+# 会让内存随语言对数量线性增长；超出容量时淘汰最久未用的
+# 语言对，其权重随引用释放交给GC回收
+_ARGOS_TRANSLATOR_CACHE_SIZE = 2
+_ARGOS_TRANSLATOR_CACHE: OrderedDict = OrderedDict()
+_ARGOS_TRANSLATOR_CACHE_LOCK = threading.Lock()
+
+# 超过该长度的段落在送入Argos前先按句切开：
+# 束搜索耗时随输入长度超线性增长，等长短句组成的批次吞吐更高
+_ARGOS_SPLIT_THRESHOLD = 600
+# 句子边界模式：在中西文句末标点后的空白处切分，标点保留在句内
+_RE_SENTENCE_SPLIT = re.compile(r'(?<=[.!?。！？])\s+')
+
+# 语言代码映射表，模块加载时构建一次（方法内定义会在每次调用时重建dict）
+# Bing翻译的语言代码映射
+_BING_LANG_MAP = {
+    "auto": "auto-detect",
+    "zh-CN": "zh-Hans",
+    "zh-TW": "zh-Hant",
+    "tl": "fil",
+    "hmn": "mww",
+    "ckb": "kmr",
+    "mn": "mn-Cyrl",
+    "no": "nb",
+    "sr": "sr-Cyrl",
+}
+
+# ArgosTranslate的语言代码映射
+_ARGOS_LANG_MAP = {
+    "zh-CN": "zh",
+    "zh-TW": "zh",
+    "en-US": "en",
+    "en-GB": "en",
+    "ja-JP": "ja",
+    "ko-KR": "ko",
+    "ru-RU": "ru",
+    "de-DE": "de",
+    "fr-FR": "fr",
+    "es-ES": "es",
+    "it-IT": "it",
+    "pt-PT": "pt",
+    "pt-BR": "pt",
+}
+
+# _find_sid用的参数提取正则，模块加载时编译一次：
+# re模块的内部缓存有容量上限，热路径之外的模式可能被挤出后反复重编译。
+# 模式按bytes编译，直接在response.content上搜索，
+# 省掉整页（约100KB）的UTF-8解码，只解码命中的捕获组
+_RE_BING_PARAMS = re.compile(rb'params_[^=]+=\s*\[[^\]]+\]')
+_RE_BING_PARAMS_PARTS = re.compile(rb'[\d]+|"[^"]+"')
+_RE_BING_DATA_IID = re.compile(rb'data-iid=[\"\']([^\"\']+)')
+_RE_BING_IG = re.compile(rb'IG[\"\']?\s*:[\"\']?\s*([^\"\']+)')
+_RE_BING_MSFT_ENDPOINT = re.compile(rb'COGNITIVE_SERVICES_ENDPOINT\s*=\s*[\"\']([^\"\']+)')
+_RE_BING_MSFT_KEY = re.compile(rb'translatorApiKey\s*[:=]\s*[\"\']([^\"\']+)')
+_RE_YANDEX_SID = re.compile(rb'sid\:\s\'[0-9a-f\.]+')
 
 # 谷歌翻译API请求头
 GOOGLE_HEADERS = {
@@ -79,20 +244,152 @@ class TranslationService:
         self.source_language = source_language
         self.target_language = target_language
         self.debug = debug
+        self.request_count = 0
+        self.success_count = 0
+        self.error_count = 0
         self.translated_count = 0
         self.total_chars = 0
+        # 批量路径在线程池里并发更新计数器，裸的+=是读-改-写三步，
+        # 并发时会丢失更新；所有更新统一走_add_stats在锁内完成
+        self._stats_lock = threading.Lock()
+        # 进度条上次重绘的时刻，用于限制重绘频率
+        self._last_progress_draw = 0.0
+        # 可选的两级翻译缓存，由工厂方法按需挂载
+        self.cache = None
     
+    def _add_stats(self, requests=0, success=0, errors=0, translated=0, chars=0):
+        """线程安全地累加统计计数器
+
+        一次调用在锁内完成多个计数器的更新，工作线程按块批量上报，
+        而不是每条文本抢一次锁。
+
+        Args:
+            requests: 新增请求数
+            success: 新增成功请求数
+            errors: 新增失败请求数
+            translated: 新增已翻译文本数
+            chars: 新增已翻译字符数
+        """
+        with self._stats_lock:
+            self.request_count += requests
+            self.success_count += success
+            self.error_count += errors
+            self.translated_count += translated
+            self.total_chars += chars
+
+    @staticmethod
+    def _chunk_texts(texts: List[str], max_chars: int = 4000, sep_len: int = len(_BATCH_SENTINEL)) -> List[List[str]]:
+        """按字符预算把文本贪心打包成块
+
+        块内所有文本加上分隔符的总长不超过max_chars；
+        单个超长文本独占一块。
+
+        Args:
+            texts: 要打包的文本列表（顺序保持）
+            max_chars: 单个请求正文的字符上限
+            sep_len: 相邻文本间分隔符的长度
+
+        Returns:
+            文本块列表，按输入顺序拼接即还原原列表
+        """
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        current_len = 0
+
+        for text in texts:
+            added = len(text) + (sep_len if current else 0)
+            if current and current_len + added > max_chars:
+                chunks.append(current)
+                current = []
+                current_len = 0
+                added = len(text)
+            current.append(text)
+            current_len += added
+
+        if current:
+            chunks.append(current)
+        return chunks
+
     def translate_batch(self, texts: List[str]) -> List[str]:
         """翻译一组文本
-        
+
+        同一个HTML文档里相同短语（导航链接、按钮标签等）往往重复出现，
+        先在批内去重，只把唯一文本交给具体服务翻译，再按原始位置展开，
+        重复文本不再重复请求。
+
         Args:
             texts: 要翻译的文本列表
-            
+
+        Returns:
+            翻译后的文本列表，顺序与输入一致
+        """
+        if not texts:
+            return []
+
+        # setdefault一趟同时建立唯一文本表和每个位置到唯一表的映射
+        uniq: dict = {}
+        order = [uniq.setdefault(text, len(uniq)) for text in texts]
+
+        if len(uniq) == len(texts):
+            return self._translate_batch_impl(texts)
+
+        self.debug_print("[翻译] 批内去重: %d 个文本中有 %d 个唯一", len(texts), len(uniq))
+        translated = self._translate_batch_impl(list(uniq))
+        return [translated[i] for i in order]
+
+    def _translate_batch_impl(self, texts: List[str]) -> List[str]:
+        """翻译一组互不相同的文本（由translate_batch去重后调用）
+
+        Args:
+            texts: 要翻译的文本列表
+
         Returns:
             翻译后的文本列表
         """
         raise NotImplementedError("子类必须实现此方法")
-    
+
+    def close(self):
+        """释放服务实例持有的资源（缓存连接等）
+
+        HTTP会话默认是进程级共享的，生命周期由close_shared_sessions()
+        统一管理，这里不关闭；注入自定义会话时由注入方负责。
+        """
+        if self.cache is not None:
+            self.cache.close()
+
+    def translate_batch_cached(self, texts: List[str]) -> List[str]:
+        """带缓存的批量翻译
+
+        先查询缓存，只把未命中的文本发给翻译服务，
+        成功后把新译文写回缓存。未挂载缓存时等价于translate_batch。
+
+        Args:
+            texts: 要翻译的文本列表
+
+        Returns:
+            翻译后的文本列表，顺序与输入一致
+        """
+        if self.cache is None or not texts:
+            return self.translate_batch(texts)
+
+        hits = self.cache.get_many(texts)
+        misses = [text for text in texts if text not in hits]
+
+        if misses:
+            self.debug_print("[翻译缓存] 命中 %d/%d 个文本", len(texts) - len(misses), len(texts))
+            translated_misses = self.translate_batch(misses)
+            new_pairs = []
+            for text, translated in zip(misses, translated_misses):
+                hits[text] = translated
+                # 翻译失败时服务会原样返回原文，这类结果不写缓存
+                if translated and translated != text:
+                    new_pairs.append((text, translated))
+            self.cache.set_many(new_pairs)
+        else:
+            self.debug_print("[翻译缓存] 全部 %d 个文本命中缓存", len(texts))
+
+        return [hits[text] for text in texts]
+
     def translate_text(self, text: str) -> str:
         """翻译单个文本
         
@@ -108,14 +405,20 @@ class TranslationService:
         results = self.translate_batch([text])
         return results[0] if results else text
 
-    def debug_print(self, message):
+    def debug_print(self, message, *args):
         """输出调试信息
-        
+
+        传入%占位符格式串和参数时，格式化推迟到确认debug开启之后，
+        关闭调试时调用点不付出任何字符串构建成本（f-string会在
+        调用前就完成求值）。
+
         Args:
-            message: 要输出的信息
+            message: 要输出的信息，或带%占位符的格式串
+            *args: 格式串参数
         """
-        if self.debug:
-            print(message, flush=True)
+        if not self.debug:
+            return
+        print(message % args if args else message, flush=True)
             
     def format_progress(self, current, total, service_name="翻译服务", success=None, requests=None):
         """格式化进度信息，生成更直观的进度显示
@@ -134,9 +437,8 @@ class TranslationService:
         percent = (current / total * 100) if total > 0 else 0
         
         # 创建一个简单的ASCII进度条(20个字符长度)
-        bar_length = 20
-        completed_length = int(bar_length * current / total) if total > 0 else 0
-        progress_bar = '█' * completed_length + '░' * (bar_length - completed_length)
+        completed_length = int(_BAR_LENGTH * current / total) if total > 0 else 0
+        progress_bar = _BAR_FULL[:completed_length] + _BAR_EMPTY[completed_length:]
         
         # 格式化基本进度信息
         progress_info = f"[{service_name}] 翻译进度: [{progress_bar}] {percent:.1f}% ({current}/{total})"
@@ -146,55 +448,95 @@ class TranslationService:
             success_rate = (success / requests * 100) if requests > 0 else 0
             progress_info += f" | 成功率: {success_rate:.1f}% ({success}/{requests})"
 
-        progress_info += "\n"    
+        progress_info += "\n"
         return progress_info
 
-    @staticmethod
-    def escape_html(text: str) -> str:
+    def draw_progress(self, current, total, service_name="翻译服务",
+                      success=None, requests=None, final=False):
+        """把进度条重绘到终端，重绘频率限制在每50ms一次
+
+        紧凑循环里每次迭代都write+flush会产生大量终端系统调用并导致闪烁，
+        限频后绝大多数迭代直接跳过。
+
+        Args:
+            current: 当前完成数量
+            total: 总数量
+            service_name: 服务名称
+            success: 成功请求数
+            requests: 总请求数
+            final: 是否为最后一次重绘（跳过限频，保证终态可见）
+        """
+        if not (self.debug and sys.stdout.isatty()):
+            return
+        now = time.monotonic()
+        if not final and now - self._last_progress_draw < 0.05:
+            return
+        self._last_progress_draw = now
+        sys.stdout.write("\r")
+        sys.stdout.write(self.format_progress(
+            current=current,
+            total=total,
+            service_name=service_name,
+            success=success,
+            requests=requests
+        ))
+        sys.stdout.flush()
+
+    # HTML转义表，构建一次后str.translate单趟完成全部替换
+    # （链式replace要对字符串做5次完整扫描，每次都分配新串）
+    _ESCAPE_TABLE = str.maketrans({
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        "'": "&#39;",
+    })
+
+    @classmethod
+    def escape_html(cls, text: str) -> str:
         """HTML转义
-        
+
         将 & < > " ' 转换为 &amp; &lt; &gt; &quot; &#39;
-        
+
         Args:
             text: 要转义的文本
-            
+
         Returns:
             转义后的文本
         """
-        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;").replace("'", "&#39;")
-    
+        return text.translate(cls._ESCAPE_TABLE)
+
     @staticmethod
     def unescape_html(text: str) -> str:
         """HTML反转义
-        
-        将 &amp; &lt; &gt; &quot; &#39; 转换为 & < > " '
-        
+
+        将 &amp; &lt; &gt; &quot; &#39; 等实体还原为原始字符
+
         Args:
             text: 要反转义的文本
-            
+
         Returns:
             反转义后的文本
         """
-        return text.replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">").replace("&quot;", '"').replace("&#39;", "'")
+        return html.unescape(text)
 
 
 class GoogleTranslationService(TranslationService):
     """谷歌翻译API服务实现"""
     
-    def __init__(self, source_language="en", target_language="zh-CN", debug=True):
+    def __init__(self, source_language="en", target_language="zh-CN", debug=True, session=None):
         """初始化谷歌翻译服务
-        
+
         Args:
             source_language: 源语言代码，默认为英语(en)
             target_language: 目标语言代码，默认为中文(zh-CN)
             debug: 是否显示调试信息
+            session: 自定义HTTP会话，None时使用进程级共享会话
         """
         super().__init__(source_language, target_language, debug)
-        self.request_count = 0
-        self.success_count = 0
-        self.error_count = 0
-        
-    def translate_batch(self, texts: List[str]) -> List[str]:
+        self.session = session if session is not None else get_shared_session('google', GOOGLE_HEADERS)
+
+    def _translate_batch_impl(self, texts: List[str]) -> List[str]:
         """使用谷歌翻译网页接口翻译文本列表
         
         Args:
@@ -207,140 +549,298 @@ class GoogleTranslationService(TranslationService):
             return []
             
         batch_size = len(texts)
-        total_chars = sum(len(text) for text in texts)
-        self.debug_print(f"\n[谷歌翻译] 开始批量翻译 {batch_size} 个文本，共 {total_chars} 个字符")
-        self.debug_print(f"[谷歌翻译] 从 {self.source_language} 翻译到 {self.target_language}")
-        
-        translations = []
+        if self.debug:
+            total_chars = sum(len(text) for text in texts)
+            self.debug_print(f"\n[谷歌翻译] 开始批量翻译 {batch_size} 个文本，共 {total_chars} 个字符")
+            self.debug_print(f"[谷歌翻译] 从 {self.source_language} 翻译到 {self.target_language}")
         
-        for i, text in enumerate(texts):
+        # 纯I/O负载：接口支持在一个GET里带多个q=参数，把若干文本
+        # 打包进同一请求（URL预算约1800字节），N个文本只需M<<N次往返；
+        # 打包后的请求再用线程池并发发送（会话连接池是线程安全的）
+        translations: List[Optional[str]] = [None] * batch_size
+
+        # 空文本不值得占用URL预算，直接回填
+        pending_indices = []
+        for index, text in enumerate(texts):
+            # text.isspace()只读扫描，不像strip()那样为判空分配新字符串
+            if text and not text.isspace():
+                pending_indices.append(index)
+            else:
+                self.debug_print("[谷歌翻译] 跳过空文本")
+                translations[index] = ""
+
+        chunks = self._pack_url_chunks([texts[i] for i in pending_indices])
+
+        def run_chunk(chunk_offset, chunk_texts):
+            """翻译一个打包块，批量请求失败时逐条降级重试"""
             try:
-                # 显示进度
-                progress = (i + 1) / batch_size * 100
-                
-                if not text.strip():
-                    self.debug_print(f"[谷歌翻译] 跳过空文本")
-                    translations.append("")
-                    continue
-                
-                # 输出原文信息
+                results = self._translate_chunk(chunk_texts)
+            except _TRANSLATE_ERRORS as e:
+                self._add_stats(errors=1)
+                self.debug_print("[错误] 谷歌翻译批量请求失败，逐条重试: %s", e)
+                results = [self._translate_one(text) for text in chunk_texts]
+            return chunk_offset, results
+
+        chunk_args = []
+        offset = 0
+        for chunk_texts in chunks:
+            chunk_args.append((offset, chunk_texts))
+            offset += len(chunk_texts)
+
+        max_workers = min(8, len(chunk_args))
+        if max_workers <= 1:
+            completed = [run_chunk(*args) for args in chunk_args]
+        else:
+            completed = []
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(run_chunk, *args) for args in chunk_args]
+                for future in as_completed(futures):
+                    completed.append(future.result())
+
+                    # 更新进度条
+                    self.draw_progress(
+                        current=self.translated_count,
+                        total=batch_size,
+                        service_name="谷歌翻译",
+                        success=self.success_count,
+                        requests=self.request_count,
+                        final=len(completed) == len(futures)
+                    )
+
+        for chunk_offset, results in completed:
+            for position, translated in enumerate(results):
+                translations[pending_indices[chunk_offset + position]] = translated
+
+        self.debug_print("\n[谷歌翻译] 批量翻译完成，成功: %d/%d", self.success_count, self.request_count)
+        return translations
+
+    def _pack_url_chunks(self, texts: List[str], max_url_chars: int = 1800) -> List[List[str]]:
+        """按URL长度预算把文本贪心打包成块
+
+        每个文本作为一个q=参数占用 len(quote(text))+3 个字符，
+        块内所有参数加上基础URL不超过max_url_chars；
+        单个超长文本独占一块（由接口自行处理）。
+
+        Args:
+            texts: 要打包的文本列表（顺序保持）
+            max_url_chars: 单个请求URL的长度上限
+
+        Returns:
+            文本块列表，按输入顺序拼接即还原原列表
+        """
+        base_len = len("https://translate.googleapis.com/translate_a/single"
+                       f"?client=gtx&sl=auto&tl={self.target_language}&dt=t")
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        current_len = base_len
+
+        for text in texts:
+            param_len = len(urllib.parse.quote(text)) + 3  # "&q="
+            if current and current_len + param_len > max_url_chars:
+                chunks.append(current)
+                current = []
+                current_len = base_len
+            current.append(text)
+            current_len += param_len
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _translate_chunk(self, chunk: List[str]) -> List[str]:
+        """用一次多q参数请求翻译一个文本块
+
+        Args:
+            chunk: 要翻译的文本块
+
+        Returns:
+            与chunk等长的译文列表
+
+        Raises:
+            Exception: 请求失败或返回结果数量不匹配时
+        """
+        # 重复的q=参数用元组列表表达，编码交给requests一次完成
+        params = [('client', 'gtx'), ('sl', 'auto'), ('tl', self.target_language), ('dt', 't')]
+        params.extend(('q', text) for text in chunk)
+
+        # 记录请求次数
+        self._add_stats(requests=1)
+        if self.debug:
+            self.debug_print(f"[谷歌翻译] 发送批量请求 #{self.request_count}（{len(chunk)} 个文本）")
+        # 计时只为调试输出服务，关闭调试时连时钟读取都省掉
+        start_time = time.perf_counter() if self.debug else 0.0
+        response = self.session.get(_GOOGLE_TRANSLATE_URL, params=params)
+        response.raise_for_status()
+
+        data = _json_loads(response.content)
+
+        # 单q时返回的是句子数组，多q时返回每个文本一个句子数组
+        per_text_sentences = [data[0]] if len(chunk) == 1 else data
+        translations = []
+        for sentences in per_text_sentences:
+            translated_text = ""
+            for sentence in sentences:
+                if sentence and sentence[0]:
+                    translated_text += sentence[0]
+            translations.append(translated_text)
+
+        if len(translations) != len(chunk):
+            raise ValueError(
+                f"批量翻译返回 {len(translations)} 条结果，预期 {len(chunk)} 条")
+
+        self._add_stats(success=1, translated=len(chunk),
+                        chars=sum(len(text) for text in chunk))
+        if self.debug:
+            self.debug_print(f"[谷歌翻译] 批量请求耗时: {time.perf_counter() - start_time:.2f}秒")
+        return translations
+
+    def _translate_one(self, text: str) -> str:
+        """翻译单个文本（translate_batch的工作单元，可在线程池中并发调用）
+
+        Args:
+            text: 要翻译的文本
+
+        Returns:
+            翻译后的文本，失败时返回原文
+        """
+        try:
+            if not text or text.isspace():
+                self.debug_print("[谷歌翻译] 跳过空文本")
+                return ""
+
+            # 输出原文信息（预览字符串只在调试时才构建）
+            if self.debug:
                 text_preview = text[:50] + "..." if len(text) > 50 else text
                 self.debug_print(f"[谷歌翻译] 原文: {text_preview}")
-                
-                # 构建谷歌翻译API请求URL
-                encoded_text = urllib.parse.quote(text)
-                url = f"https://translate.googleapis.com/translate_a/single?client=gtx&sl=auto&tl={self.target_language}&dt=t&q={encoded_text}"
-                
-                # 记录请求次数
-                self.request_count += 1
-                
-                # 发送请求
+
+            # 构建谷歌翻译API请求参数（编码交给requests一次完成）
+            params = {'client': 'gtx', 'sl': 'auto', 'tl': self.target_language,
+                      'dt': 't', 'q': text}
+
+            # 记录请求次数
+            self._add_stats(requests=1)
+
+            # 发送请求
+            if self.debug:
                 self.debug_print(f"[谷歌翻译] 发送请求 #{self.request_count}")
-                start_time = time.time()
-                response = requests.get(url, headers=GOOGLE_HEADERS)
-                response.raise_for_status()
-                elapsed_time = time.time() - start_time
-                
-                # 解析响应数据
-                data = response.json()
-                translated_text = ""
-                
-                # 提取翻译结果
-                for sentence in data[0]:
-                    if sentence[0]:
-                        translated_text += sentence[0]
-                
-                # 记录成功次数
-                self.success_count += 1
-                self.translated_count += 1
-                self.total_chars += len(text)
-                
-                # 输出翻译结果
+            start_time = time.perf_counter() if self.debug else 0.0
+            response = self.session.get(_GOOGLE_TRANSLATE_URL, params=params)
+            response.raise_for_status()
+
+            # 解析响应数据
+            data = _json_loads(response.content)
+            translated_text = ""
+
+            # 提取翻译结果
+            for sentence in data[0]:
+                if sentence[0]:
+                    translated_text += sentence[0]
+
+            # 记录成功次数
+            self._add_stats(success=1, translated=1, chars=len(text))
+
+            # 输出翻译结果
+            if self.debug:
                 trans_preview = translated_text[:50] + "..." if len(translated_text) > 50 else translated_text
                 self.debug_print(f"[谷歌翻译] 译文: {trans_preview}")
-                self.debug_print(f"[谷歌翻译] 请求耗时: {elapsed_time:.2f}秒")
-                
-                translations.append(translated_text)
-                
-                # # 避免请求频率过高
-                # if i < len(texts) - 1:  # 不是最后一个
-                #     self.debug_print(f"[谷歌翻译] 等待100ms避免请求过于频繁...")
-                #     time.sleep(0.1)
-                
-            except Exception as e:
-                self.error_count += 1
-                error_msg = f"谷歌翻译请求失败 ({self.error_count}/{self.request_count}): {str(e)}"
-                self.debug_print(f"[错误] {error_msg}")
-                # 失败时返回原文
-                translations.append(text)
-                
-            # 更新进度条
-            if self.debug and sys.stdout.isatty():
-                sys.stdout.write("\r")
-                sys.stdout.write(self.format_progress(
-                    current=self.translated_count, 
-                    total=batch_size, 
-                    service_name="谷歌翻译", 
-                    success=self.success_count, 
-                    requests=self.request_count
-                ))
-                sys.stdout.flush()
-        
-        self.debug_print(f"\n[谷歌翻译] 批量翻译完成，成功: {self.success_count}/{self.request_count}")
-        return translations
+                self.debug_print(f"[谷歌翻译] 请求耗时: {time.perf_counter() - start_time:.2f}秒")
+
+            return translated_text
+
+        except _TRANSLATE_ERRORS as e:
+            self._add_stats(errors=1)
+            if self.debug:
+                self.debug_print(f"[错误] 谷歌翻译请求失败 ({self.error_count}/{self.request_count}): {str(e)}")
+            # 失败时返回原文
+            return text
 
 
 class BingTranslationService(TranslationService):
     """微软(Bing)翻译服务实现"""
-    
-    def __init__(self, source_language="en", target_language="zh-CN", debug=True):
+
+    # SID在12小时内全局有效，没有理由每个实例各取一份：
+    # 参数缓存提升为类属性供所有实例共享，锁保证并发初始化时只取一次
+    _sid_lock = threading.Lock()
+    _sid_cache = {'sid': None, 'iid_ig': None, 'ts': 0}
+
+    def __init__(self, source_language="en", target_language="zh-CN", debug=True, session=None):
         """初始化微软(Bing)翻译服务
-        
+
         Args:
             source_language: 源语言代码，默认为英语(en)
             target_language: 目标语言代码，默认为中文(zh-CN)
             debug: 是否显示调试信息
+            session: 自定义HTTP会话，None时使用进程级共享会话
         """
         super().__init__(source_language, target_language, debug)
-        self.request_count = 0
-        self.success_count = 0
-        self.error_count = 0
         self.translate_sid = None
         self.translate_iid_ig = None
         self.last_sid_fetch_time = 0
-        self._fetch_lock = False
-    
+        # SID字符串解析出的请求参数缓存（按来源字符串失效）
+        self._sid_params = {}
+        self._sid_params_src = None
+        # 默认头按热路径（翻译请求）配置；_find_sid的页面抓取单独传头覆盖
+        self.session = session if session is not None else get_shared_session('bing', BING_TRANSLATE_HEADERS)
+
+    def _get_sid_params(self) -> dict:
+        """把SID字符串解析成POST参数字典
+
+        解析结果按来源字符串缓存，SID刷新后自动重新解析。
+
+        Returns:
+            token/key等参数的字典，SID未就绪时为空字典
+        """
+        sid = self.translate_sid
+        if self._sid_params_src != sid:
+            self._sid_params = dict(urllib.parse.parse_qsl(sid.lstrip('&'))) if sid else {}
+            self._sid_params_src = sid
+        return self._sid_params
+
     def _find_sid(self):
         """查找Bing翻译所需的SID(参数)
-        
-        从Bing翻译页面获取必要参数，用于翻译请求
+
+        优先复用所有实例共享的参数缓存（12小时有效期），
+        未命中时在锁内抓取Bing翻译页面并回填缓存，
+        并发调用不会重复抓取
+        """
+        cache = BingTranslationService._sid_cache
+        with BingTranslationService._sid_lock:
+            current_time = time.time()
+
+            # 检查是否需要更新SID
+            if cache['sid'] and current_time - cache['ts'] < 12 * 3600:  # 12小时有效期
+                self.translate_sid = cache['sid']
+                self.translate_iid_ig = cache['iid_ig']
+                self.last_sid_fetch_time = cache['ts']
+                return
+
+            self._fetch_sid(current_time)
+            cache['sid'] = self.translate_sid
+            cache['iid_ig'] = self.translate_iid_ig
+            cache['ts'] = self.last_sid_fetch_time
+
+    def _fetch_sid(self, current_time):
+        """从Bing翻译页面抓取参数并写到实例属性上
+
+        Args:
+            current_time: 本次抓取的时间戳
         """
-        # 防止重复获取
-        if self._fetch_lock:
-            return
-        
-        self._fetch_lock = True
-        current_time = time.time()
-        
-        # 检查是否需要更新SID
-        if self.translate_sid and current_time - self.last_sid_fetch_time < 12 * 3600:  # 12小时有效期
-            self._fetch_lock = False
-            return
-            
         try:
-            self.debug_print(f"[微软翻译] 正在获取Bing翻译参数...")
+            self.debug_print("[微软翻译] 正在获取Bing翻译参数...")
             
-            response = requests.get("https://www.bing.com/translator", headers=BING_PARAMS_HEADERS, timeout=10)
+            response = self.session.get("https://www.bing.com/translator", headers=BING_PARAMS_HEADERS, timeout=10)
             response.raise_for_status()
             
-            html_text = response.text
-            
+            # 在原始字节上搜索，整页解码只在调试输出时进行
+            content = response.content
+
             # 调试输出页面内容片段
             if self.debug:
+                html_text = response.text
                 snippet_size = 500
                 html_snippet = html_text[:snippet_size] + "... [截断]" if len(html_text) > snippet_size else html_text
                 self.debug_print(f"[微软翻译] 获取到页面内容片段:\n{html_snippet}")
-                
+
                 # 确认关键字搜索
                 key_phrases = ["params_RichTranslateHelper", "data-iid", "IG:"]
                 for phrase in key_phrases:
@@ -348,70 +848,64 @@ class BingTranslationService(TranslationService):
                         self.debug_print(f"[微软翻译] 页面包含关键字: {phrase}")
                     else:
                         self.debug_print(f"[微软翻译] 页面不包含关键字: {phrase}")
-            
+
             # 使用更宽松的正则表达式
-            params_match = re.search(r'params_[^=]+=\s*\[[^\]]+\]', html_text)
-            data_iid_match = re.search(r'data-iid=[\"\']([^\"\']+)', html_text)
-            ig_match = re.search(r'IG[\"\']?\s*:[\"\']?\s*([^\"\']+)', html_text)
-            
+            params_match = _RE_BING_PARAMS.search(content)
+            data_iid_match = _RE_BING_DATA_IID.search(content)
+            ig_match = _RE_BING_IG.search(content)
+
             # 输出匹配结果
             if self.debug:
                 self.debug_print(f"[微软翻译] params_match: {params_match.group(0) if params_match else 'None'}")
                 self.debug_print(f"[微软翻译] data_iid_match: {data_iid_match.group(0) if data_iid_match else 'None'}")
                 self.debug_print(f"[微软翻译] ig_match: {ig_match.group(0) if ig_match else 'None'}")
-            
+
             # 尝试新的参数提取方式
-            if html_text:
+            if content:
                 # 先尝试第一种方式
                 if params_match and data_iid_match and ig_match:
                     params_text = params_match.group(0)
-                    params_parts = re.findall(r'[\d]+|"[^"]+"', params_text)
-                    
-                    data_iid = data_iid_match.group(1) if len(data_iid_match.groups()) >= 1 else data_iid_match.group(0).split('=')[1].strip('"\'')
-                    ig = ig_match.group(1) if len(ig_match.groups()) >= 1 else ig_match.group(0).split(':')[1].strip('"\'')
-                    
+                    params_parts = _RE_BING_PARAMS_PARTS.findall(params_text)
+
+                    data_iid = data_iid_match.group(1).decode('utf-8', 'replace')
+                    ig = ig_match.group(1).decode('utf-8', 'replace')
+
                     if len(params_parts) >= 2:
-                        key = params_parts[0].strip('"\'')
-                        token = params_parts[1].strip('"\'')
-                        
+                        key = params_parts[0].decode('utf-8', 'replace').strip('"\'')
+                        token = params_parts[1].decode('utf-8', 'replace').strip('"\'')
+
                         self.translate_sid = f"&token={token}&key={key}"
                         self.translate_iid_ig = f"IG={ig}&IID={data_iid}"
                         self.last_sid_fetch_time = current_time
-                        self.debug_print(f"[微软翻译] Bing翻译参数获取成功: {self.translate_sid[:20]}...")
-                        self._fetch_lock = False
+                        self.debug_print("[微软翻译] Bing翻译参数获取成功: %s...", self.translate_sid[:20])
                         return
-                
+
                 # 尝试搜索COGNITIVE_SERVICES_ENDPOINT 和 API key
-                msft_endpoint_match = re.search(r'COGNITIVE_SERVICES_ENDPOINT\s*=\s*[\"\']([^\"\']+)', html_text)
-                msft_key_match = re.search(r'translatorApiKey\s*[:=]\s*[\"\']([^\"\']+)', html_text)
-                
+                msft_endpoint_match = _RE_BING_MSFT_ENDPOINT.search(content)
+                msft_key_match = _RE_BING_MSFT_KEY.search(content)
+
                 if msft_endpoint_match and msft_key_match:
-                    endpoint = msft_endpoint_match.group(1)
-                    apikey = msft_key_match.group(1)
-                    self.debug_print(f"[微软翻译] 找到Microsoft Translator API参数")
+                    endpoint = msft_endpoint_match.group(1).decode('utf-8', 'replace')
+                    apikey = msft_key_match.group(1).decode('utf-8', 'replace')
+                    self.debug_print("[微软翻译] 找到Microsoft Translator API参数")
                     self.translate_sid = f"&key={apikey}"
                     self.translate_endpoint = endpoint
                     self.translate_iid_ig = "使用API"
                     self.last_sid_fetch_time = current_time
-                    self._fetch_lock = False
                     return
             
             # 如果所有方法都失败，则不设置sid和iid，翻译会失败
-            self.debug_print(f"[微软翻译] 无法获取有效的Bing翻译参数。")
+            self.debug_print("[微软翻译] 无法获取有效的Bing翻译参数。")
             self.translate_sid = None
             self.translate_iid_ig = None
             self.last_sid_fetch_time = current_time
-            self._fetch_lock = False
-            return
-            
+
         except Exception as e:
-            self.debug_print(f"[错误] 获取Bing翻译参数失败: {str(e)}")
+            self.debug_print("[错误] 获取Bing翻译参数失败: %s", e)
             self.translate_sid = None # Ensure reset on exception
             self.translate_iid_ig = None
-        
-        self._fetch_lock = False
-    
-    def translate_batch(self, texts: List[str]) -> List[str]:
+
+    def _translate_batch_impl(self, texts: List[str]) -> List[str]:
         """使用微软(Bing)翻译网页接口翻译文本列表
         
         Args:
@@ -427,108 +921,203 @@ class BingTranslationService(TranslationService):
         self._find_sid()
         
         batch_size = len(texts)
-        total_chars = sum(len(text) for text in texts)
-        self.debug_print(f"\n[微软翻译] 开始批量翻译 {batch_size} 个文本，共 {total_chars} 个字符")
-        self.debug_print(f"[微软翻译] 从 {self.source_language} 翻译到 {self.target_language}")
+        if self.debug:
+            total_chars = sum(len(text) for text in texts)
+            self.debug_print(f"\n[微软翻译] 开始批量翻译 {batch_size} 个文本，共 {total_chars} 个字符")
+            self.debug_print(f"[微软翻译] 从 {self.source_language} 翻译到 {self.target_language}")
         
         # 根据目标语言调整语言代码
         source_lang = self._normalize_language_code(self.source_language)
         target_lang = self._normalize_language_code(self.target_language)
         
-        translations = []
-        
         # 正常使用Bing翻译参数
         if not self.translate_sid or not self.translate_iid_ig:
-            self.debug_print(f"[微软翻译] 翻译参数未就绪，无法翻译")
+            self.debug_print("[微软翻译] 翻译参数未就绪，无法翻译")
             return texts  # 返回原文
-        
-        for i, text in enumerate(texts):
+
+        # 纯I/O负载：把若干文本用哨兵串接进同一个POST（文本预算约4000字符），
+        # N个文本只需M<<N次往返；打包后的请求再用线程池并发发送，
+        # SID已在主线程就绪，工作线程只做HTTP往返和解析
+        translations: List[Optional[str]] = [None] * batch_size
+
+        # 空文本不值得占用文本预算，直接回填
+        pending_indices = []
+        for index, text in enumerate(texts):
+            if text and not text.isspace():
+                pending_indices.append(index)
+            else:
+                self.debug_print("[微软翻译] 跳过空文本")
+                translations[index] = ""
+
+        chunks = self._chunk_texts([texts[i] for i in pending_indices])
+
+        def run_chunk(chunk_offset, chunk_texts):
+            """翻译一个打包块，批量请求失败时逐条降级重试"""
             try:
-                # 显示进度
-                progress = (i + 1) / batch_size * 100
-                
-                if not text.strip():
-                    self.debug_print(f"[微软翻译] 跳过空文本")
-                    translations.append("")
-                    continue
-                
-                # 输出原文信息
+                results = self._translate_chunk(chunk_texts, source_lang, target_lang)
+            except _TRANSLATE_ERRORS as e:
+                self._add_stats(errors=1)
+                self.debug_print("[错误] 微软翻译批量请求失败，逐条重试: %s", e)
+                results = [self._translate_one(text, source_lang, target_lang)
+                           for text in chunk_texts]
+            return chunk_offset, results
+
+        chunk_args = []
+        offset = 0
+        for chunk_texts in chunks:
+            chunk_args.append((offset, chunk_texts))
+            offset += len(chunk_texts)
+
+        max_workers = min(8, len(chunk_args))
+        if max_workers <= 1:
+            completed = [run_chunk(*args) for args in chunk_args]
+        else:
+            completed = []
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(run_chunk, *args) for args in chunk_args]
+                for future in as_completed(futures):
+                    completed.append(future.result())
+
+                    # 更新进度条
+                    self.draw_progress(
+                        current=self.translated_count,
+                        total=batch_size,
+                        service_name="微软翻译",
+                        success=self.success_count,
+                        requests=self.request_count,
+                        final=len(completed) == len(futures)
+                    )
+
+        for chunk_offset, results in completed:
+            for position, translated in enumerate(results):
+                translations[pending_indices[chunk_offset + position]] = translated
+
+        self.debug_print("\n[微软翻译] 批量翻译完成，成功: %d/%d", self.success_count, self.request_count)
+        return translations
+
+    def _translate_chunk(self, chunk: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """用一次哨兵串接请求翻译一个文本块
+
+        Args:
+            chunk: 要翻译的文本块
+            source_lang: 标准化后的源语言代码
+            target_lang: 标准化后的目标语言代码
+
+        Returns:
+            与chunk等长的译文列表
+
+        Raises:
+            Exception: 请求失败或拆分结果数量不匹配时
+        """
+        joined_text = _BATCH_SENTINEL.join(chunk)
+
+        url = f"{_BING_TRANSLATE_URL}?isVertical=1&{self.translate_iid_ig}"
+        data = {'fromLang': source_lang, 'text': joined_text, 'to': target_lang}
+        data.update(self._get_sid_params())
+
+        # 记录请求次数
+        self._add_stats(requests=1)
+        if self.debug:
+            self.debug_print(f"[微软翻译] 发送批量请求 #{self.request_count}（{len(chunk)} 个文本）")
+        # 计时只为调试输出服务，关闭调试时连时钟读取都省掉
+        start_time = time.perf_counter() if self.debug else 0.0
+        response = self.session.post(url, data=data)
+        response.raise_for_status()
+
+        result = _json_loads(response.content)
+        if not (result and len(result) > 0 and 'translations' in result[0]
+                and len(result[0]['translations']) > 0):
+            raise ValueError(f"未获取到有效翻译结果: {str(result)[:200]}")
+
+        translated_joined = result[0]['translations'][0]['text']
+        parts = translated_joined.split(_BATCH_SENTINEL)
+        if len(parts) != len(chunk):
+            # 翻译可能改动哨兵周围的空白，放宽拆分再试一次
+            parts = [part.strip() for part in _RE_SENTINEL_SPLIT.split(translated_joined)]
+        if len(parts) != len(chunk):
+            raise ValueError(
+                f"批量翻译拆分出 {len(parts)} 条结果，预期 {len(chunk)} 条")
+
+        self._add_stats(success=1, translated=len(chunk), chars=len(joined_text))
+        if self.debug:
+            self.debug_print(f"[微软翻译] 批量请求耗时: {time.perf_counter() - start_time:.2f}秒")
+        return parts
+
+    def _translate_one(self, text: str, source_lang: str, target_lang: str) -> str:
+        """翻译单个文本（translate_batch的工作单元，可在线程池中并发调用）
+
+        Args:
+            text: 要翻译的文本
+            source_lang: 标准化后的源语言代码
+            target_lang: 标准化后的目标语言代码
+
+        Returns:
+            翻译后的文本，失败时返回原文
+        """
+        try:
+            if not text or text.isspace():
+                self.debug_print("[微软翻译] 跳过空文本")
+                return ""
+
+            # 输出原文信息（预览字符串只在调试时才构建）
+            if self.debug:
                 text_preview = text[:50] + "..." if len(text) > 50 else text
                 self.debug_print(f"[微软翻译] 原文: {text_preview}")
-                
-                # 构建请求URL和数据
-                url = f"https://www.bing.com/ttranslatev3?isVertical=1&{self.translate_iid_ig}"
-                data = f"&fromLang={source_lang}&text={urllib.parse.quote(text)}&to={target_lang}{self.translate_sid}"
-                
-                # 记录请求次数
-                self.request_count += 1
-                
-                # 发送请求
+
+            # 构建请求URL和数据（正文编码交给requests一次完成）
+            url = f"{_BING_TRANSLATE_URL}?isVertical=1&{self.translate_iid_ig}"
+            data = {'fromLang': source_lang, 'text': text, 'to': target_lang}
+            data.update(self._get_sid_params())
+
+            # 记录请求次数
+            self._add_stats(requests=1)
+
+            # 发送请求
+            if self.debug:
                 self.debug_print(f"[微软翻译] 发送请求 #{self.request_count}")
-                start_time = time.time()
-                response = requests.post(url, data=data, headers=BING_TRANSLATE_HEADERS)
-                
-                # 添加错误处理
-                if response.status_code != 200:
-                    self.debug_print(f"[微软翻译] 请求返回状态码: {response.status_code}")
-                    if self.debug:
-                        self.debug_print(f"[微软翻译] 响应内容: {response.text[:200]}")
-                    raise Exception(f"请求失败，状态码: {response.status_code}")
-                    
-                elapsed_time = time.time() - start_time
-                
-                # 解析响应数据
-                try:
-                    result = response.json()
-                except:
+            start_time = time.perf_counter() if self.debug else 0.0
+            response = self.session.post(url, data=data)
+
+            # 添加错误处理
+            if response.status_code != 200:
+                self.debug_print("[微软翻译] 请求返回状态码: %s", response.status_code)
+                if self.debug:
+                    self.debug_print(f"[微软翻译] 响应内容: {response.text[:200]}")
+                raise ValueError(f"请求失败，状态码: {response.status_code}")
+
+            # 解析响应数据
+            try:
+                result = _json_loads(response.content)
+            except ValueError:
+                if self.debug:
                     self.debug_print(f"[微软翻译] 响应不是有效的JSON: {response.text[:100]}")
-                    raise Exception("无法解析JSON响应")
-                
-                if result and len(result) > 0 and 'translations' in result[0] and len(result[0]['translations']) > 0:
-                    translated_text = result[0]['translations'][0]['text']
-                    
-                    # 记录成功次数
-                    self.success_count += 1
-                    self.translated_count += 1
-                    self.total_chars += len(text)
-                    
-                    # 输出翻译结果
+                raise ValueError("无法解析JSON响应")
+
+            if result and len(result) > 0 and 'translations' in result[0] and len(result[0]['translations']) > 0:
+                translated_text = result[0]['translations'][0]['text']
+
+                # 记录成功次数
+                self._add_stats(success=1, translated=1, chars=len(text))
+
+                # 输出翻译结果
+                if self.debug:
                     trans_preview = translated_text[:50] + "..." if len(translated_text) > 50 else translated_text
                     self.debug_print(f"[微软翻译] 译文: {trans_preview}")
-                    self.debug_print(f"[微软翻译] 请求耗时: {elapsed_time:.2f}秒")
-                    
-                    translations.append(translated_text)
-                else:
-                    self.debug_print(f"[微软翻译] 未获取到有效翻译结果")
-                    self.debug_print(f"[微软翻译] 响应内容: {str(result)[:200]}")
-                    translations.append(text)  # 返回原文
-                
-                ## 避免请求频率过高
-                # if i < len(texts) - 1:  # 不是最后一个
-                #     self.debug_print(f"[微软翻译] 等待100ms避免请求过于频繁...")
-                #     time.sleep(0.1)
-                
-            except Exception as e:
-                self.error_count += 1
-                error_msg = f"微软翻译请求失败 ({self.error_count}/{self.request_count}): {str(e)}"
-                self.debug_print(f"[错误] {error_msg}")
-                # 失败时返回原文
-                translations.append(text)
-                
-            # 更新进度条
-            if self.debug and sys.stdout.isatty():
-                sys.stdout.write("\r")
-                sys.stdout.write(self.format_progress(
-                    current=self.translated_count, 
-                    total=batch_size, 
-                    service_name="微软翻译", 
-                    success=self.success_count, 
-                    requests=self.request_count
-                ))
-                sys.stdout.flush()
-        
-        self.debug_print(f"\n[微软翻译] 批量翻译完成，成功: {self.success_count}/{self.request_count}")
-        return translations
+                    self.debug_print(f"[微软翻译] 请求耗时: {time.perf_counter() - start_time:.2f}秒")
+
+                return translated_text
+
+            if self.debug:
+                self.debug_print("[微软翻译] 未获取到有效翻译结果")
+                self.debug_print(f"[微软翻译] 响应内容: {str(result)[:200]}")
+            return text  # 返回原文
+
+        except _TRANSLATE_ERRORS as e:
+            self._add_stats(errors=1)
+            if self.debug:
+                self.debug_print(f"[错误] 微软翻译请求失败 ({self.error_count}/{self.request_count}): {str(e)}")
+            # 失败时返回原文
+            return text
     
     def _normalize_language_code(self, lang_code: str) -> str:
         """标准化语言代码
@@ -541,196 +1130,204 @@ class BingTranslationService(TranslationService):
         Returns:
             标准化后的语言代码
         """
-        # 语言代码映射表
-        lang_map = {
-            "auto": "auto-detect",
-            "zh-CN": "zh-Hans",
-            "zh-TW": "zh-Hant",
-            "tl": "fil",
-            "hmn": "mww",
-            "ckb": "kmr",
-            "mn": "mn-Cyrl",
-            "no": "nb",
-            "sr": "sr-Cyrl",
-        }
-        
-        return lang_map.get(lang_code, lang_code)
+        return _BING_LANG_MAP.get(lang_code, lang_code)
 
 
 class YandexTranslationService(TranslationService):
     """Yandex翻译服务实现"""
-    
-    def __init__(self, source_language="en", target_language="zh-CN", debug=True):
+
+    # 与Bing服务相同：SID全局有效12小时，类级缓存供所有实例共享
+    _sid_lock = threading.Lock()
+    _sid_cache = {'sid': None, 'ts': 0}
+
+    def __init__(self, source_language="en", target_language="zh-CN", debug=True, session=None):
         """初始化Yandex翻译服务
-        
+
         Args:
             source_language: 源语言代码，默认为英语(en)
             target_language: 目标语言代码，默认为中文(zh-CN)
             debug: 是否显示调试信息
+            session: 自定义HTTP会话，None时使用进程级共享会话
         """
         super().__init__(source_language, target_language, debug)
-        self.request_count = 0
-        self.success_count = 0
-        self.error_count = 0
         self.translate_sid = None
         self.last_sid_fetch_time = 0
-        self._fetch_lock = False
-    
+        # 默认头按热路径（翻译请求）配置；_find_sid的参数抓取单独传头覆盖
+        self.session = session if session is not None else get_shared_session('yandex', YANDEX_TRANSLATE_HEADERS)
+
     def _find_sid(self):
         """查找Yandex翻译所需的SID(参数)
-        
-        从Yandex翻译页面获取必要参数，用于翻译请求
+
+        优先复用所有实例共享的参数缓存（12小时有效期），
+        未命中时在锁内抓取Yandex翻译页面并回填缓存，
+        并发调用不会重复抓取
+        """
+        cache = YandexTranslationService._sid_cache
+        with YandexTranslationService._sid_lock:
+            current_time = time.time()
+
+            # 检查是否需要更新SID
+            if cache['sid'] and current_time - cache['ts'] < 12 * 3600:  # 12小时有效期
+                self.translate_sid = cache['sid']
+                self.last_sid_fetch_time = cache['ts']
+                return
+
+            self._fetch_sid(current_time)
+            cache['sid'] = self.translate_sid
+            cache['ts'] = self.last_sid_fetch_time
+
+    def _fetch_sid(self, current_time):
+        """从Yandex翻译页面抓取参数并写到实例属性上
+
+        Args:
+            current_time: 本次抓取的时间戳
         """
-        # 防止重复获取
-        if self._fetch_lock:
-            return
-        
-        self._fetch_lock = True
-        current_time = time.time()
-        
-        # 检查是否需要更新SID
-        if self.translate_sid and current_time - self.last_sid_fetch_time < 12 * 3600:  # 12小时有效期
-            self._fetch_lock = False
-            return
-            
         try:
-            self.debug_print(f"[Yandex翻译] 正在获取Yandex翻译参数...")
+            self.debug_print("[Yandex翻译] 正在获取Yandex翻译参数...")
             
-            response = requests.get("https://translate.yandex.net/website-widget/v1/widget.js?widgetId=ytWidget&pageLang=es&widgetTheme=light&autoMode=false", headers=YANDEX_PARAMS_HEADERS, timeout=10)
+            response = self.session.get("https://translate.yandex.net/website-widget/v1/widget.js?widgetId=ytWidget&pageLang=es&widgetTheme=light&autoMode=false", headers=YANDEX_PARAMS_HEADERS, timeout=10)
             response.raise_for_status()
             
-            text = response.text
-            sid_match = re.search(r'sid\:\s\'[0-9a-f\.]+', text)
-            
+            # 在原始字节上搜索，省掉整个widget脚本的解码
+            sid_match = _RE_YANDEX_SID.search(response.content)
+
             if sid_match and sid_match.group(0) and len(sid_match.group(0)) > 7:
-                self.translate_sid = sid_match.group(0)[6:]
+                self.translate_sid = sid_match.group(0)[6:].decode('ascii', 'replace')
                 self.last_sid_fetch_time = current_time
-                self.debug_print(f"[Yandex翻译] 参数获取成功: {self.translate_sid[:10]}...")
-                self._fetch_lock = False
+                self.debug_print("[Yandex翻译] 参数获取成功: %s...", self.translate_sid[:10])
                 return
-            
-            self.debug_print(f"[Yandex翻译] 无法从Yandex翻译页面提取必要参数")
-            
+
+            self.debug_print("[Yandex翻译] 无法从Yandex翻译页面提取必要参数")
+
         except Exception as e:
-            self.debug_print(f"[错误] 获取Yandex翻译参数失败: {str(e)}")
-        
-        self._fetch_lock = False
-    
-    def translate_batch(self, texts: List[str]) -> List[str]:
+            self.debug_print("[错误] 获取Yandex翻译参数失败: %s", e)
+
+    def _translate_batch_impl(self, texts: List[str]) -> List[str]:
         """使用Yandex翻译网页接口翻译文本列表
-        
+
+        文本先按字符预算打包成块，每块用<wbr>标签连接成一次请求；
+        大批量不再把全部文本塞进同一个URL（GET请求受URL长度约束）。
+
         Args:
             texts: 要翻译的文本列表
-            
+
         Returns:
             翻译后的文本列表
         """
         if not texts:
             return []
-        
+
         # 获取必要参数
         self._find_sid()
         if not self.translate_sid:
-            self.debug_print(f"[Yandex翻译] 翻译参数未就绪，无法翻译")
+            self.debug_print("[Yandex翻译] 翻译参数未就绪，无法翻译")
             return texts  # 返回原文
-        
+
         batch_size = len(texts)
-        total_chars = sum(len(text) for text in texts)
-        self.debug_print(f"\n[Yandex翻译] 开始批量翻译 {batch_size} 个文本，共 {total_chars} 个字符")
-        self.debug_print(f"[Yandex翻译] 从 {self.source_language} 翻译到 {self.target_language}")
-        
-        translations = []
-        
-        # 使用<wbr>标签连接多个文本，进行批量翻译
-        # 也可以单独翻译每个文本，这里演示批量翻译
-        joined_text = "<wbr>".join([self.escape_html(text) for text in texts])
-        
+        if self.debug:
+            total_chars = sum(len(text) for text in texts)
+            self.debug_print("\n[Yandex翻译] 开始批量翻译 %d 个文本，共 %d 个字符", batch_size, total_chars)
+            self.debug_print("[Yandex翻译] 从 %s 翻译到 %s", self.source_language, self.target_language)
+
+        # 标准化语言代码（中文需要特殊处理）
+        source_lang = self.source_language
+        target_lang = self.target_language
+        if source_lang.startswith("zh"):
+            source_lang = "zh"
+        if target_lang.startswith("zh"):
+            target_lang = "zh"
+
+        lang_param = f"{source_lang if source_lang != 'auto' else ''}-{target_lang}"
+        if lang_param.startswith("-"):
+            lang_param = lang_param[1:]
+
+        # GET请求的字符预算比Bing的POST正文保守（URL编码还会再膨胀）
+        chunks = self._chunk_texts(texts, max_chars=2000, sep_len=len(_WBR))
+
+        translations: List[str] = []
+        for chunk_number, chunk in enumerate(chunks, start=1):
+            translations.extend(self._translate_chunk(chunk, lang_param))
+
+            # 更新进度条
+            self.draw_progress(
+                current=self.translated_count,
+                total=batch_size,
+                service_name="Yandex翻译",
+                success=self.success_count,
+                requests=self.request_count,
+                final=chunk_number == len(chunks)
+            )
+
+        self.debug_print("\n[Yandex翻译] 批量翻译完成，成功: %d/%d", self.success_count, self.request_count)
+        return translations
+
+    def _translate_chunk(self, chunk: List[str], lang_param: str) -> List[str]:
+        """用一次<wbr>串接请求翻译一个文本块
+
+        Args:
+            chunk: 要翻译的文本块
+            lang_param: 标准化后的语言方向参数（如'en-zh'）
+
+        Returns:
+            与chunk等长的译文列表，失败时相应位置回填原文
+        """
+        # 使用<wbr>标签连接多个文本，format=html模式下引擎原样保留
+        joined_text = _WBR.join([self.escape_html(text) for text in chunk])
+
         try:
-            # 标准化语言代码
-            source_lang = self.source_language
-            target_lang = self.target_language
-            
-            # 中文需要特殊处理
-            if source_lang.startswith("zh"):
-                source_lang = "zh"
-            if target_lang.startswith("zh"):
-                target_lang = "zh"
-            
-            # 构建请求URL
-            lang_param = f"{source_lang if source_lang != 'auto' else ''}-{target_lang}"
-            if lang_param.startswith("-"):
-                lang_param = lang_param[1:]
-                
-            url = f"https://translate.yandex.net/api/v1/tr.json/translate?srv=tr-url-widget&id={self.translate_sid}-0-0&format=html&lang={lang_param}&text={urllib.parse.quote(joined_text)}"
-            
+            params = {'srv': 'tr-url-widget', 'id': f"{self.translate_sid}-0-0",
+                      'format': 'html', 'lang': lang_param, 'text': joined_text}
+
             # 记录请求次数
-            self.request_count += 1
-            
+            self._add_stats(requests=1)
+
             # 发送请求
-            self.debug_print(f"[Yandex翻译] 发送请求 #{self.request_count}")
-            start_time = time.time()
-            response = requests.get(url, headers=YANDEX_TRANSLATE_HEADERS)
+            self.debug_print("[Yandex翻译] 发送请求 #%d（%d 个文本）", self.request_count, len(chunk))
+            # 计时只为调试输出服务，关闭调试时连时钟读取都省掉
+            start_time = time.perf_counter() if self.debug else 0.0
+            response = self.session.get(_YANDEX_TRANSLATE_URL, params=params)
             response.raise_for_status()
-            elapsed_time = time.time() - start_time
-            
+
             # 解析响应数据
-            result = response.json()
-            
-            if result and 'text' in result and len(result['text']) > 0:
-                # 获取检测到的语言
-                detected_lang = result.get('lang', '').split('-')[0] if '-' in result.get('lang', '') else None
-                
-                # 获取翻译文本并拆分回列表
-                translated_joined = result['text'][0]
-                translated_items = translated_joined.split("<wbr>")
-                
-                # 反转义HTML
-                translated_items = [self.unescape_html(item) for item in translated_items]
-                
-                # 处理返回结果数量不匹配的情况
-                if len(translated_items) != len(texts):
-                    self.debug_print(f"[警告] Yandex翻译返回的结果数量 ({len(translated_items)}) 与原文数量 ({len(texts)}) 不匹配")
-                    # 如果数量不匹配，则尽可能填充，剩余的使用原文
-                    if len(translated_items) < len(texts):
-                        translated_items.extend(texts[len(translated_items):])
-                    else:
-                        translated_items = translated_items[:len(texts)]
-                
-                # 更新统计信息
-                self.success_count += 1
-                self.translated_count += batch_size
-                self.total_chars += total_chars
-                
-                # 输出翻译结果预览
-                self.debug_print(f"[Yandex翻译] 检测到的语言: {detected_lang or '未知'}")
-                self.debug_print(f"[Yandex翻译] 翻译完成，耗时: {elapsed_time:.2f}秒")
-                
-                translations = translated_items
-            else:
-                self.debug_print(f"[Yandex翻译] 未获取到有效翻译结果")
-                translations = texts  # 返回原文
-                
-        except Exception as e:
-            self.error_count += 1
-            error_msg = f"Yandex翻译请求失败 ({self.error_count}/{self.request_count}): {str(e)}"
-            self.debug_print(f"[错误] {error_msg}")
+            result = _json_loads(response.content)
+
+            if not (result and 'text' in result and len(result['text']) > 0):
+                self.debug_print("[Yandex翻译] 未获取到有效翻译结果")
+                return list(chunk)  # 返回原文
+
+            # 获取检测到的语言
+            detected_lang = result.get('lang', '').split('-')[0] if '-' in result.get('lang', '') else None
+
+            # 获取翻译文本并拆分回列表，反转义HTML
+            translated_items = [self.unescape_html(item)
+                                for item in result['text'][0].split(_WBR)]
+
+            # 处理返回结果数量不匹配的情况
+            if len(translated_items) != len(chunk):
+                self.debug_print("[警告] Yandex翻译返回的结果数量 (%d) 与原文数量 (%d) 不匹配", len(translated_items), len(chunk))
+                # 如果数量不匹配，则尽可能填充，剩余的使用原文
+                if len(translated_items) < len(chunk):
+                    translated_items.extend(chunk[len(translated_items):])
+                else:
+                    translated_items = translated_items[:len(chunk)]
+
+            # 更新统计信息
+            self._add_stats(success=1, translated=len(chunk),
+                            chars=sum(len(text) for text in chunk))
+
+            # 输出翻译结果预览
+            if self.debug:
+                self.debug_print("[Yandex翻译] 检测到的语言: %s", detected_lang or '未知')
+                self.debug_print("[Yandex翻译] 翻译完成，耗时: %.2f秒", time.perf_counter() - start_time)
+
+            return translated_items
+
+        except _TRANSLATE_ERRORS as e:
+            self._add_stats(errors=1)
+            if self.debug:
+                self.debug_print(f"[错误] Yandex翻译请求失败 ({self.error_count}/{self.request_count}): {str(e)}")
             # 失败时返回原文
-            translations = texts
-            
-        # 更新进度条
-        if self.debug and sys.stdout.isatty():
-            sys.stdout.write("\r")
-            sys.stdout.write(self.format_progress(
-                current=self.translated_count, 
-                total=batch_size, 
-                service_name="Yandex翻译", 
-                success=self.success_count, 
-                requests=self.request_count
-            ))
-            sys.stdout.flush()
-        
-        self.debug_print(f"\n[Yandex翻译] 批量翻译完成，成功: {self.success_count}/{self.request_count}")
-        return translations
+            return list(chunk)
 
 
 class ArgosTranslationService(TranslationService):
@@ -745,14 +1342,23 @@ class ArgosTranslationService(TranslationService):
             debug: 是否显示调试信息
         """
         super().__init__(source_language, target_language, debug)
-        self.request_count = 0
-        self.success_count = 0
-        self.error_count = 0
-        
+
+        # argostranslate在导入时读取ARGOS_DEVICE_TYPE决定模型跑在
+        # CPU还是CUDA上；通过HFIT_ARGOS_DEVICE暴露这个开关（cpu/cuda/auto），
+        # 已显式设置过ARGOS_DEVICE_TYPE时不覆盖
+        hfit_device = os.environ.get('HFIT_ARGOS_DEVICE')
+        if hfit_device:
+            os.environ.setdefault('ARGOS_DEVICE_TYPE', hfit_device)
+
+        # 延迟导入重量级依赖，模块引用缓存在实例上供后续调用使用
+        from argostranslate import translate, package
+        self._argos_translate = translate
+        self._argos_package = package
+
         # 规范化语言代码
         self.norm_source_language = self._normalize_language_code(source_language)
         self.norm_target_language = self._normalize_language_code(target_language)
-        
+
         # 初始化时检查并安装所需的翻译包
         self._ensure_translation_package()
         
@@ -765,39 +1371,23 @@ class ArgosTranslationService(TranslationService):
         Returns:
             标准化后的语言代码
         """
-        # ArgosTranslate语言代码映射
-        lang_map = {
-            "zh-CN": "zh",
-            "zh-TW": "zh",
-            "en-US": "en",
-            "en-GB": "en",
-            "ja-JP": "ja",
-            "ko-KR": "ko",
-            "ru-RU": "ru",
-            "de-DE": "de",
-            "fr-FR": "fr",
-            "es-ES": "es",
-            "it-IT": "it",
-            "pt-PT": "pt",
-            "pt-BR": "pt"
-        }
-        
         # 对于包含'-'的语言代码，尝试获取主要部分
-        if "-" in lang_code and lang_code not in lang_map:
+        if "-" in lang_code and lang_code not in _ARGOS_LANG_MAP:
             main_lang = lang_code.split("-")[0]
             return main_lang
-            
-        return lang_map.get(lang_code, lang_code)
+
+        return _ARGOS_LANG_MAP.get(lang_code, lang_code)
     
     def _ensure_translation_package(self):
         """确保安装了所需的翻译包"""
+        package = self._argos_package
         try:
             # 获取已安装的翻译包
             installed_packages = package.get_installed_packages()
             
             # 检查是否已经安装了所需的翻译包
             if not any(pkg.from_code == self.norm_source_language and pkg.to_code == self.norm_target_language for pkg in installed_packages):
-                self.debug_print(f"[ArgosTranslate] 未找到翻译包 {self.norm_source_language} -> {self.norm_target_language}，尝试下载...")
+                self.debug_print("[ArgosTranslate] 未找到翻译包 %s -> %s，尝试下载...", self.norm_source_language, self.norm_target_language)
                 
                 # 更新包索引
                 package.update_package_index()
@@ -811,20 +1401,20 @@ class ArgosTranslationService(TranslationService):
                         break
                 
                 if target_pkg:
-                    self.debug_print(f"[ArgosTranslate] 正在下载翻译包 {self.norm_source_language} -> {self.norm_target_language}...")
+                    self.debug_print("[ArgosTranslate] 正在下载翻译包 %s -> %s...", self.norm_source_language, self.norm_target_language)
                     download_path = target_pkg.download()
-                    self.debug_print(f"[ArgosTranslate] 正在安装翻译包...")
+                    self.debug_print("[ArgosTranslate] 正在安装翻译包...")
                     package.install_from_path(download_path)
-                    self.debug_print(f"[ArgosTranslate] 翻译包安装完成")
+                    self.debug_print("[ArgosTranslate] 翻译包安装完成")
                 else:
-                    self.debug_print(f"[ArgosTranslate] 警告：未找到可用的翻译包 {self.norm_source_language} -> {self.norm_target_language}")
+                    self.debug_print("[ArgosTranslate] 警告：未找到可用的翻译包 %s -> %s", self.norm_source_language, self.norm_target_language)
             else:
-                self.debug_print(f"[ArgosTranslate] 已安装翻译包 {self.norm_source_language} -> {self.norm_target_language}")
-                
+                self.debug_print("[ArgosTranslate] 已安装翻译包 %s -> %s", self.norm_source_language, self.norm_target_language)
+
         except Exception as e:
-            self.debug_print(f"[ArgosTranslate] 初始化翻译包时出错: {str(e)}")
+            self.debug_print("[ArgosTranslate] 初始化翻译包时出错: %s", e)
     
-    def translate_batch(self, texts: List[str]) -> List[str]:
+    def _translate_batch_impl(self, texts: List[str]) -> List[str]:
         """使用ArgosTranslate本地翻译文本列表
         
         Args:
@@ -837,94 +1427,259 @@ class ArgosTranslationService(TranslationService):
             return []
             
         batch_size = len(texts)
-        total_chars = sum(len(text) for text in texts)
-        self.debug_print(f"\n[ArgosTranslate] 开始批量翻译 {batch_size} 个文本，共 {total_chars} 个字符")
-        self.debug_print(f"[ArgosTranslate] 从 {self.source_language} ({self.norm_source_language}) 翻译到 {self.target_language} ({self.norm_target_language})")
-        
-        translations = []
+        if self.debug:
+            total_chars = sum(len(text) for text in texts)
+            self.debug_print(f"\n[ArgosTranslate] 开始批量翻译 {batch_size} 个文本，共 {total_chars} 个字符")
+            self.debug_print(f"[ArgosTranslate] 从 {self.source_language} ({self.norm_source_language}) 翻译到 {self.target_language} ({self.norm_target_language})")
         
-        for i, text in enumerate(texts):
+        # 模型每次调用都有固定的束搜索准备开销，把若干文本用哨兵串接后
+        # 一次调用翻译，再拆分回列表，摊薄每条文本的固定成本
+        translations: List[Optional[str]] = [None] * batch_size
+
+        # 空文本直接回填
+        pending_indices = []
+        for index, text in enumerate(texts):
+            if text and not text.isspace():
+                pending_indices.append(index)
+            else:
+                self.debug_print("[ArgosTranslate] 跳过空文本")
+                translations[index] = ""
+
+        pending_texts = [texts[i] for i in pending_indices]
+
+        # 超长段落先按句切开摊平到一个扁平列表，所有句子走同一个
+        # 批量循环，译完后按偏移重组回段落；offsets[i]:offsets[i+1]
+        # 是第i个待译文本对应的句子区间
+        segments: List[str] = []
+        offsets = [0]
+        for text in pending_texts:
+            if len(text) > _ARGOS_SPLIT_THRESHOLD:
+                segments.extend(_RE_SENTENCE_SPLIT.split(text))
+            else:
+                segments.append(text)
+            offsets.append(len(segments))
+
+        # 批量调用的耗时由批内最长序列决定（短句要陪跑到最长句的
+        # 填充长度），先按长度排序再分块，让每个块内的句子长度相近，
+        # 译完后按排序前的下标散射回原位
+        sorted_order = sorted(range(len(segments)), key=lambda i: len(segments[i]))
+        flat_results: List[Optional[str]] = [None] * len(segments)
+        done = 0
+        for start in range(0, len(sorted_order), _ARGOS_CHUNK_SIZE):
+            chunk_order = sorted_order[start:start + _ARGOS_CHUNK_SIZE]
+            chunk = [segments[i] for i in chunk_order]
             try:
-                # 显示进度
-                progress = (i + 1) / batch_size * 100
-                
-                if not text.strip():
-                    self.debug_print(f"[ArgosTranslate] 跳过空文本")
-                    translations.append("")
-                    continue
-                
-                # 输出原文信息
+                results = self._translate_chunk(chunk)
+            except Exception as e:
+                self._add_stats(errors=1)
+                if self.debug:
+                    self.debug_print(f"[错误] ArgosTranslate批量翻译失败，逐条重试: {str(e)}")
+                results = [self._translate_one(text) for text in chunk]
+
+            for segment_index, translated in zip(chunk_order, results):
+                flat_results[segment_index] = translated
+            done += len(chunk)
+
+            # 更新进度条
+            self.draw_progress(
+                current=self.translated_count,
+                total=batch_size,
+                service_name="ArgosTranslate",
+                success=self.success_count,
+                requests=self.request_count,
+                final=done == len(segments)
+            )
+
+        for position, index in enumerate(pending_indices):
+            parts = flat_results[offsets[position]:offsets[position + 1]]
+            translations[index] = parts[0] if len(parts) == 1 else " ".join(parts)
+
+        self.debug_print("\n[ArgosTranslate] 批量翻译完成，成功: %d/%d", self.success_count, self.request_count)
+        return translations
+
+    def _get_translator(self):
+        """获取（并缓存）已加载的翻译对象
+
+        翻译对象在进程级LRU缓存中按语言对共享：按语言对解析涉及
+        遍历已安装包，而长期持有所有语言对的模型权重又会吃光内存，
+        缓存容量之外最久未用的语言对被淘汰，下次用到时重新解析。
+
+        Returns:
+            翻译对象，解析失败时为None（调用方退回模块级接口）
+        """
+        key = (self.norm_source_language, self.norm_target_language)
+        with _ARGOS_TRANSLATOR_CACHE_LOCK:
+            translator = _ARGOS_TRANSLATOR_CACHE.get(key)
+            if translator is not None:
+                _ARGOS_TRANSLATOR_CACHE.move_to_end(key)
+                return translator
+
+        try:
+            translator = self._argos_translate.get_translation_from_codes(*key)
+        except Exception:
+            # 解析失败不进缓存，下次调用重试
+            return None
+
+        with _ARGOS_TRANSLATOR_CACHE_LOCK:
+            _ARGOS_TRANSLATOR_CACHE[key] = translator
+            _ARGOS_TRANSLATOR_CACHE.move_to_end(key)
+            while len(_ARGOS_TRANSLATOR_CACHE) > _ARGOS_TRANSLATOR_CACHE_SIZE:
+                _ARGOS_TRANSLATOR_CACHE.popitem(last=False)
+        return translator
+
+    def _translate_text(self, text: str) -> str:
+        """执行一次底层模型调用
+
+        Args:
+            text: 要翻译的文本
+
+        Returns:
+            翻译后的文本
+        """
+        translator = self._get_translator()
+        if translator is not None:
+            return translator.translate(text)
+        return self._argos_translate.translate(
+            text, self.norm_source_language, self.norm_target_language)
+
+    def _translate_chunk(self, chunk: List[str]) -> List[str]:
+        """用一次哨兵串接调用翻译一个文本块
+
+        Args:
+            chunk: 要翻译的文本块
+
+        Returns:
+            与chunk等长的译文列表
+
+        Raises:
+            Exception: 翻译失败或拆分结果数量不匹配时
+        """
+        # 记录请求次数
+        self._add_stats(requests=1)
+        if self.debug:
+            self.debug_print(f"[ArgosTranslate] 批量翻译请求 #{self.request_count}（{len(chunk)} 个文本）")
+
+        # 新版argostranslate的翻译对象直接暴露批量接口，模型一次前向
+        # 处理整个列表；可用时优先走它，免去哨兵串接和拆分
+        translator = self._get_translator()
+        if translator is not None and hasattr(translator, 'translate_batch'):
+            start_time = time.perf_counter() if self.debug else 0.0
+            parts = list(translator.translate_batch(chunk))
+            if len(parts) != len(chunk):
+                raise ValueError(
+                    f"批量翻译返回 {len(parts)} 条结果，预期 {len(chunk)} 条")
+
+            self._add_stats(success=1, translated=len(chunk),
+                            chars=sum(len(text) for text in chunk))
+            if self.debug:
+                self.debug_print(f"[ArgosTranslate] 批量翻译耗时: {time.perf_counter() - start_time:.2f}秒")
+            return parts
+
+        joined_text = _BATCH_SENTINEL.join(chunk)
+        start_time = time.perf_counter() if self.debug else 0.0
+        translated_joined = self._translate_text(joined_text)
+
+        parts = translated_joined.split(_BATCH_SENTINEL)
+        if len(parts) != len(chunk):
+            # 翻译可能改动哨兵周围的空白，放宽拆分再试一次
+            parts = [part.strip() for part in _RE_SENTINEL_SPLIT.split(translated_joined)]
+        if len(parts) != len(chunk):
+            raise ValueError(
+                f"批量翻译拆分出 {len(parts)} 条结果，预期 {len(chunk)} 条")
+
+        self._add_stats(success=1, translated=len(chunk), chars=len(joined_text))
+        if self.debug:
+            self.debug_print(f"[ArgosTranslate] 批量翻译耗时: {time.perf_counter() - start_time:.2f}秒")
+        return parts
+
+    def _translate_one(self, text: str) -> str:
+        """翻译单个文本（批量调用失败时的降级路径）
+
+        Args:
+            text: 要翻译的文本
+
+        Returns:
+            翻译后的文本，失败时返回原文
+        """
+        try:
+            # 输出原文信息（预览字符串只在调试时才构建）
+            if self.debug:
                 text_preview = text[:50] + "..." if len(text) > 50 else text
                 self.debug_print(f"[ArgosTranslate] 原文: {text_preview}")
-                
-                # 记录请求次数
-                self.request_count += 1
-                
-                # 执行翻译
+
+            # 记录请求次数
+            self._add_stats(requests=1)
+
+            # 执行翻译
+            if self.debug:
                 self.debug_print(f"[ArgosTranslate] 翻译请求 #{self.request_count}")
-                start_time = time.time()
-                translated_text = translate.translate(text, self.norm_source_language, self.norm_target_language)
-                elapsed_time = time.time() - start_time
-                
-                # 记录成功次数
-                self.success_count += 1
-                self.translated_count += 1
-                self.total_chars += len(text)
-                
-                # 输出翻译结果
+            start_time = time.perf_counter() if self.debug else 0.0
+            translated_text = self._translate_text(text)
+
+            # 记录成功次数
+            self._add_stats(success=1, translated=1, chars=len(text))
+
+            # 输出翻译结果
+            if self.debug:
                 trans_preview = translated_text[:50] + "..." if len(translated_text) > 50 else translated_text
                 self.debug_print(f"[ArgosTranslate] 译文: {trans_preview}")
-                self.debug_print(f"[ArgosTranslate] 翻译耗时: {elapsed_time:.2f}秒")
-                
-                translations.append(translated_text)
-                
-            except Exception as e:
-                self.error_count += 1
-                error_msg = f"ArgosTranslate翻译请求失败 ({self.error_count}/{self.request_count}): {str(e)}"
-                self.debug_print(f"[错误] {error_msg}")
-                # 失败时返回原文
-                translations.append(text)
-                
-            # 更新进度条
-            if self.debug and sys.stdout.isatty():
-                sys.stdout.write("\r")
-                sys.stdout.write(self.format_progress(
-                    current=self.translated_count, 
-                    total=batch_size, 
-                    service_name="ArgosTranslate", 
-                    success=self.success_count, 
-                    requests=self.request_count
-                ))
-                sys.stdout.flush()
-        
-        self.debug_print(f"\n[ArgosTranslate] 批量翻译完成，成功: {self.success_count}/{self.request_count}")
-        return translations
+                self.debug_print(f"[ArgosTranslate] 翻译耗时: {time.perf_counter() - start_time:.2f}秒")
 
+            return translated_text
 
-def get_translation_service(service_name="google", source_language="en", target_language="zh-CN", debug=True):
+        except Exception as e:
+            self._add_stats(errors=1)
+            if self.debug:
+                self.debug_print(f"[错误] ArgosTranslate翻译请求失败 ({self.error_count}/{self.request_count}): {str(e)}")
+            # 失败时返回原文
+            return text
+
+
+# 服务名到实现类的注册表：工厂按名O(1)分发，新增服务在此登记即可。
+# argostranslate本身在ArgosTranslationService.__init__里才延迟导入，
+# 注册类引用不会触发模型相关依赖的加载
+_SERVICE_REGISTRY = {
+    "google": GoogleTranslationService,
+    "bing": BingTranslationService,
+    "yandex": YandexTranslationService,
+    "argos": ArgosTranslationService,
+}
+
+
+def get_translation_service(service_name="google", source_language="en", target_language="zh-CN", debug=True, cache_path=None):
     """工厂方法，根据名称创建对应的翻译服务实例
-    
+
     Args:
         service_name: 翻译服务名称，支持'google'、'bing'、'yandex'、'argos'
         source_language: 源语言代码
         target_language: 目标语言代码
         debug: 是否显示调试信息
-        
+        cache_path: 翻译缓存SQLite文件路径，None表示不启用缓存
+
     Returns:
         TranslationService: 翻译服务实例
-        
+
     Raises:
         ValueError: 如果指定的服务名称不支持
     """
     service_name = service_name.lower()
-    
-    if service_name == "google":
-        return GoogleTranslationService(source_language, target_language, debug)
-    elif service_name == "bing":
-        return BingTranslationService(source_language, target_language, debug)
-    elif service_name == "yandex":
-        return YandexTranslationService(source_language, target_language, debug)
-    elif service_name == "argos":
-        return ArgosTranslationService(source_language, target_language, debug)
-    else:
-        raise ValueError(f"不支持的翻译服务: {service_name}。目前支持 'google'、'bing'、'yandex'、'argos'。") 
\ No newline at end of file
+
+    service_cls = _SERVICE_REGISTRY.get(service_name)
+    if service_cls is None:
+        raise ValueError(f"不支持的翻译服务: {service_name}。目前支持 'google'、'bing'、'yandex'、'argos'。")
+    service = service_cls(source_language, target_language, debug)
+
+    if cache_path:
+        try:
+            service.cache = TranslationCache(
+                cache_path=cache_path,
+                service_name=service_name,
+                source_language=source_language,
+                target_language=target_language
+            )
+        except Exception as e:
+            # 缓存不可用时降级为无缓存，不影响翻译本身
+            if debug:
+                print(f"[翻译缓存] 初始化缓存失败，已禁用缓存: {str(e)}")
+
+    return service 
\ No newline at end of file